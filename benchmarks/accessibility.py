@@ -0,0 +1,47 @@
+import time
+from typing import Callable
+from xml.etree.ElementTree import fromstring
+
+from corpus import snapshot_formulas
+
+from latex2mathml.converter import Converter
+from latex2mathml.speech import symbol_words
+
+REPEAT = 10
+
+
+def best_of(function: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def second_pass(formulas: list[str]) -> None:
+    converter = Converter()
+    for latex in formulas:
+        mathml = converter.convert(latex)
+        " ".join(symbol_words(text.strip()) for text in fromstring(mathml).itertext() if text.strip())
+
+
+def single_pass(formulas: list[str]) -> None:
+    converter = Converter(alttext=True, annotation=True, speech=True)
+    for latex in formulas:
+        converter.convert(latex)
+
+
+def main() -> None:
+    formulas = snapshot_formulas()
+    print(f"{len(formulas)} formulas, best of {REPEAT}")
+    plain = best_of(lambda: [Converter().convert(latex) for latex in formulas])
+    second = best_of(lambda: second_pass(formulas))
+    single = best_of(lambda: single_pass(formulas))
+    print(f"  convert() only                        {plain:.1f}ms")
+    print(f"  convert() then parse output for speech {second:.1f}ms (+{second / plain - 1:.0%})")
+    print(f"  alttext, annotation and speech options {single:.1f}ms (+{single / plain - 1:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import time
+from typing import Callable, TypeVar
+from xml.etree.ElementTree import tostring
+from xml.sax.saxutils import unescape
+
+from latex2mathml.converter import Converter, convert, convert_bytes, convert_to_element
+
+FORMULAS = [
+    rb"x^2 + y^2 = z^2",
+    rb"\frac{-b \pm \sqrt{b^2 - 4ac}}{2a}",
+    rb"\sum_{i=0}^{n} \alpha_i x^i \leq \int_0^\infty e^{-t} \, dt",
+    rb"\begin{pmatrix} a & b \\ c & d \end{pmatrix} \text{for all } x \in \mathbb{R}",
+    "\\text{caf\u00e9} \\to \u221e".encode(),
+]
+REPEAT = 5
+ROUNDS = 2_000
+
+T = TypeVar("T")
+
+
+def best_of(function: Callable[[T], bytes], inputs: list[T]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for item in inputs:
+                function(item)
+        best = min(best, time.perf_counter() - start)
+    return best / ROUNDS / len(inputs) * 1e6
+
+
+def decode_convert_encode(data: bytes) -> bytes:
+    """
+    The request path before `convert_bytes()`: `tostring()` and `unescape()` copy the whole MathML string twice more.
+    """
+    return unescape(tostring(convert_to_element(data.decode()), encoding="unicode")).encode()
+
+
+def main() -> None:
+    print(f"{len(FORMULAS)} formulas x {ROUNDS}, best of {REPEAT}")
+    baseline = best_of(decode_convert_encode, FORMULAS)
+    print(f"{'decode/tostring/unescape/encode':>32}: {baseline:.1f}us/formula")
+    for label, function in [
+        ("convert(data.decode()).encode()", lambda data: convert(data.decode()).encode()),
+        ("convert_bytes(data)", convert_bytes),
+    ]:
+        elapsed = best_of(function, FORMULAS)
+        print(f"{label:>32}: {elapsed:.1f}us/formula ({baseline / elapsed:.2f}x)")
+
+    print("serialization only")
+    elements = [convert_to_element(data.decode()) for data in FORMULAS]
+    baseline = best_of(lambda element: unescape(tostring(element, encoding="unicode")).encode(), elements)
+    elapsed = best_of(lambda element: Converter().serialize(element).encode(), elements)
+    print(f"{'tostring/unescape/encode':>32}: {baseline:.1f}us/formula")
+    print(f"{'serializer':>32}: {elapsed:.1f}us/formula ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import time
+import tracemalloc
+from typing import Callable
+from xml.etree.ElementTree import Element
+
+from corpus import snapshot_formulas
+
+from latex2mathml.converter import convert_many_to_element, convert_to_element
+
+REPEAT = 5
+
+
+def each(formulas: list[str], body: Element) -> None:
+    for latex in formulas:
+        convert_to_element(latex, parent=body)
+
+
+def many(formulas: list[str], body: Element) -> None:
+    convert_many_to_element(formulas, body)
+
+
+def measure(function: Callable[[list[str], Element], object], formulas: list[str]) -> tuple[float, float]:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(formulas, Element("body"))
+        best = min(best, time.perf_counter() - start)
+    body = Element("body")
+    tracemalloc.start()
+    function(formulas, body)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1e3, size / 2**20
+
+
+def main() -> None:
+    formulas = snapshot_formulas()
+    print(f"{len(formulas)} snapshot formulas under one parent, best of {REPEAT}")
+    for label, function in [
+        ("convert_to_element(parent=body)", each),
+        ("convert_many_to_element()", many),
+    ]:
+        elapsed, size = measure(function, formulas)
+        print(f"{label:>32}: {elapsed:.1f}ms, page {size:.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
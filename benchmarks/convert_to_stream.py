@@ -0,0 +1,35 @@
+import os
+import time
+import tracemalloc
+from typing import Callable, TextIO
+
+from latex2mathml.converter import convert, convert_to_stream
+
+TERMS = 2_000
+LATEX = " + ".join(rf"\frac{{x_{{{i}}}}}{{\alpha^{{{i}}}}}" for i in range(TERMS))
+
+
+def measure(function: Callable[[str, TextIO], object]) -> tuple[float, float]:
+    with open(os.devnull, "w", encoding="utf-8") as f:
+        start = time.perf_counter()
+        function(LATEX, f)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        function(LATEX, f)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    print(f"{TERMS} fractions, {len(convert(LATEX))} characters of MathML")
+    for label, function in [
+        ("f.write(convert(latex))", lambda latex, f: f.write(convert(latex))),
+        ("convert_to_stream(latex, f)", convert_to_stream),
+    ]:
+        elapsed, peak = measure(function)
+        print(f"{label:>28}: {elapsed:.2f}s, peak traced memory {peak:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def snapshot_formulas() -> list[str]:
+    """
+    Returns the Latex strings of the block snapshot tests in `tests/test_converter.py`.
+    """
+    sys.path.insert(0, str(ROOT))
+    from tests.test_converter import test_converter
+
+    return [param.values[0] for mark in getattr(test_converter, "pytestmark") for param in mark.args[1]]
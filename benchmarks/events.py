@@ -0,0 +1,43 @@
+import time
+from typing import Callable
+from xml.etree.ElementTree import TreeBuilder, fromstring
+
+from corpus import snapshot_formulas
+
+from latex2mathml.converter import convert
+from latex2mathml.events import convert_to_events
+
+REPEAT = 5
+
+
+def best_of(function: Callable[[str], object], formulas: list[str]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for latex in formulas:
+            function(latex)
+        best = min(best, time.perf_counter() - start)
+    return best / len(formulas) * 1e6
+
+
+def parse(latex: str) -> object:
+    return fromstring(convert(latex, display="block"))
+
+
+def main() -> None:
+    formulas = []
+    for latex in snapshot_formulas():  # only the MathML strings that parse, e.g. no raw `<` from `\text{<}`
+        try:
+            parse(latex)
+        except Exception:
+            continue
+        formulas.append(latex)
+    print(f"{len(formulas)} snapshot formulas, best of {REPEAT}")
+    baseline = best_of(parse, formulas)
+    elapsed = best_of(lambda latex: convert_to_events(latex, TreeBuilder(), display="block"), formulas)
+    print(f"{'fromstring(convert())':>36}: {baseline:.1f}us/formula")
+    print(f"{'convert_to_events(TreeBuilder())':>36}: {elapsed:.1f}us/formula ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import resource
+import subprocess
+import sys
+import time
+
+from latex2mathml.batch import BACKENDS, convert_chunk, convert_records, make_executor
+
+RECORDS = 20_000
+JOBS = 4
+FORMULAS = [
+    rf"\begin{{bmatrix}} a_{{{i}}} & \frac{{{i}}}{{2}} \\ \sqrt{{x^{i}}} & \sum_{{k=0}}^{{{i}}} k \end{{bmatrix}}"
+    for i in range(RECORDS)
+]
+
+
+def run(backend: str) -> None:
+    try:
+        executor = make_executor(backend, JOBS)
+    except RuntimeError as e:
+        print(f"{backend:>12}: skipped ({e})")
+        return
+    with executor:
+        start = time.perf_counter()
+        executor.submit(convert_chunk, ["x"]).result()
+        latency = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in convert_records(enumerate(FORMULAS), executor=executor):
+            pass
+        elapsed = time.perf_counter() - start
+    # ru_maxrss is a lifetime peak in KiB, so each backend runs in a fresh process; for the process backend,
+    # RUSAGE_CHILDREN is the peak of the largest worker, which the pool has joined on shutdown
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    worker = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(
+        f"{backend:>12}: start {latency * 1000:.1f}ms, {RECORDS / elapsed:.0f} records/s, "
+        f"peak RSS {own:.0f}MiB, largest worker process {worker:.0f}MiB"
+    )
+
+
+def main() -> None:
+    print(f"{RECORDS} records, {JOBS} workers")
+    for backend in BACKENDS:
+        subprocess.run([sys.executable, __file__, backend], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,39 @@
+import time
+
+from latex2mathml.converter import convert
+from latex2mathml.incremental import Session
+
+ROWS = 200
+EDITS = 100
+LATEX = (
+    r"\begin{align}"
+    + r" \\ ".join(rf"f_{{{i}}}(x) &= \frac{{x^{{{i}}}}}{{{i} + 1}} + \sqrt{{x}}" for i in range(ROWS))
+    + r"\end{align}"
+)
+
+
+def main() -> None:
+    session = Session(display="block")
+    session.convert(LATEX)
+    latex = LATEX
+    offset = latex.index(r"\sqrt{x}", len(latex) // 2) + len(r"\sqrt{")
+
+    start = time.perf_counter()
+    for _ in range(EDITS):
+        latex = latex[:offset] + "y" + latex[offset:]
+        convert(latex, display="block")
+    full = (time.perf_counter() - start) / EDITS
+
+    start = time.perf_counter()
+    for _ in range(EDITS):
+        session.edit(offset, 0, "y")
+    incremental = (time.perf_counter() - start) / EDITS
+
+    assert session.latex == latex
+    print(f"{ROWS} rows, one-character edit in a row")
+    print(f"       full conversion: {full * 1000:.2f}ms")
+    print(f"incremental conversion: {incremental * 1000:.2f}ms ({full / incremental:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import time
+from typing import Callable
+
+from corpus import snapshot_formulas
+
+from latex2mathml.converter import cached_convert
+from latex2mathml.lazy import LazyMathML
+
+RENDERED = (1.0, 0.5, 0.1)
+REPEAT = 5
+
+
+def best_of(function: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        cached_convert.cache_clear()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    formulas = snapshot_formulas()
+    print(f"{len(formulas)} formulas, best of {REPEAT}")
+    eager = best_of(lambda: [cached_convert(latex) for latex in formulas])
+    for fraction in RENDERED:
+        count = int(len(formulas) * fraction)
+        lazy = best_of(lambda: [str(formula) for formula in [LazyMathML(latex) for latex in formulas][:count]])
+        print(f"  {count} rendered: eager {eager:.1f}ms, LazyMathML {lazy:.1f}ms ({eager / lazy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
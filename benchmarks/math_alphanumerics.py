@@ -0,0 +1,36 @@
+import time
+from typing import Callable
+
+from corpus import snapshot_formulas
+
+from latex2mathml.converter import UNICODE, convert
+
+REPEAT = 10
+
+
+def best_of(function: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    formulas = snapshot_formulas()
+    print(f"{len(formulas)} formulas, UTF-8 with unicode output encoding, best of {REPEAT}")
+    for math_alphanumerics in (False, True):
+        outputs = [convert(latex, output_encoding=UNICODE, math_alphanumerics=math_alphanumerics) for latex in formulas]
+        size = sum(len(output.encode()) for output in outputs)
+        attributes = sum(output.count("mathvariant=") for output in outputs)
+        elapsed = best_of(
+            lambda: [
+                convert(latex, output_encoding=UNICODE, math_alphanumerics=math_alphanumerics) for latex in formulas
+            ]
+        )
+        print(f"  math_alphanumerics={math_alphanumerics!s:5} {size} B, {attributes} mathvariant, {elapsed:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import time
+
+from corpus import snapshot_formulas
+
+from latex2mathml.converter import Converter, convert_to_element
+
+REPEAT = 5
+
+
+def main() -> None:
+    formulas = snapshot_formulas()
+    print(f"{len(formulas)} snapshot formulas")
+    for optimize in (False, True):
+        elements = [convert_to_element(latex, display="block", optimize=optimize) for latex in formulas]
+        nodes = sum(1 for element in elements for _ in element.iter())
+        rows = sum(1 for element in elements for _ in element.iter("mrow"))
+        size = sum(len(Converter().serialize(element).encode()) for element in elements)
+        best = float("inf")
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            for latex in formulas:
+                convert_to_element(latex, display="block", optimize=optimize)
+            best = min(best, time.perf_counter() - start)
+        label = "optimize=True" if optimize else "optimize=False"
+        elapsed = best / len(formulas) * 1e6
+        print(f"{label:>14}: {nodes} nodes ({rows} mrow), {size} UTF-8 bytes, {elapsed:.1f}us/formula")
+
+
+if __name__ == "__main__":
+    main()
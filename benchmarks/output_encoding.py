@@ -0,0 +1,32 @@
+import time
+
+from corpus import snapshot_formulas
+
+from latex2mathml.converter import NUMERIC, OUTPUT_ENCODINGS, Converter, convert_to_element
+
+REPEAT = 5
+ROUNDS = 20
+
+
+def main() -> None:
+    elements = [convert_to_element(latex, display="block") for latex in snapshot_formulas()]
+    print(f"{len(elements)} snapshot formulas, serialization best of {REPEAT}")
+    baseline = sum(len(Converter().serialize(element).encode()) for element in elements)
+    for output_encoding in OUTPUT_ENCODINGS:
+        serialize = Converter(output_encoding=output_encoding).serialize
+        size = sum(len(serialize(element).encode()) for element in elements)
+        best = float("inf")
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                for element in elements:
+                    serialize(element)
+            best = min(best, time.perf_counter() - start)
+        saved = (baseline - size) / baseline * 100
+        elapsed = best / ROUNDS / len(elements) * 1e6
+        label = f"{output_encoding} (default)" if output_encoding == NUMERIC else output_encoding
+        print(f"{label:>17}: {size} UTF-8 bytes ({saved:.1f}% smaller), {elapsed:.1f}us/formula")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import time
+
+from latex2mathml.batch import Pipeline
+from latex2mathml.converter import convert
+
+RECORDS = 5_000
+FORMULAS = [
+    rf"\begin{{align}} f_{{{i}}}(x) &= \int_0^{{{i}}} \frac{{\sin t}}{{t}}\,dt \\ g(x) &= \sqrt[3]{{x^{i} + 1}}"
+    rf"\end{{align}}"
+    for i in range(RECORDS)
+]
+
+
+def main() -> None:
+    start = time.perf_counter()
+    for latex in FORMULAS:
+        convert(latex, display="block")
+    print(f"  sequential: {RECORDS / (time.perf_counter() - start):.0f} records/s")
+
+    pipeline = Pipeline(display="block")
+    start = time.perf_counter()
+    for _ in pipeline.convert(FORMULAS):
+        pass
+    print(f"   pipelined: {RECORDS / (time.perf_counter() - start):.0f} records/s")
+    for stats in pipeline.stats:
+        print(f"  {stats!r}")
+
+
+if __name__ == "__main__":
+    main()
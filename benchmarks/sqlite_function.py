@@ -0,0 +1,43 @@
+import random
+import sqlite3
+import time
+
+from latex2mathml.converter import cached_convert
+from latex2mathml.sqlite import register_function
+
+ROWS = 100_000
+DISTINCT = 2_000
+
+
+def make_table() -> sqlite3.Connection:
+    random.seed(0)
+    formulas = [rf"\frac{{{i}}}{{x_{{{i % 7}}}}} + \sqrt{{{i}}}" for i in range(DISTINCT)]
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE formulas (id INTEGER PRIMARY KEY, latex TEXT, mathml TEXT)")
+    connection.executemany("INSERT INTO formulas (latex) VALUES (?)", ((random.choice(formulas),) for _ in range(ROWS)))
+    return connection
+
+
+def python_loop(connection: sqlite3.Connection) -> None:
+    rows = connection.execute("SELECT id, latex FROM formulas").fetchall()
+    connection.executemany(
+        "UPDATE formulas SET mathml = ? WHERE id = ?", ((cached_convert(latex), i) for i, latex in rows)
+    )
+
+
+def in_database(connection: sqlite3.Connection) -> None:
+    register_function(connection)
+    connection.execute("UPDATE formulas SET mathml = latex2mathml(latex)")
+
+
+def main() -> None:
+    for name, function in (("python loop", python_loop), ("in-database", in_database)):
+        connection = make_table()
+        cached_convert.cache_clear()
+        start = time.perf_counter()
+        function(connection)
+        print(f"{name:>12}: {time.perf_counter() - start:.2f}s for {ROWS} rows")
+
+
+if __name__ == "__main__":
+    main()
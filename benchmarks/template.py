@@ -0,0 +1,44 @@
+import random
+import time
+from typing import Callable
+
+from latex2mathml.converter import convert
+from latex2mathml.template import PARAMETER_PATTERN, Template
+
+TEMPLATES = [
+    r"\frac{#1}{#2}\,\mathrm{kg}",
+    r"\left( #1 \pm #2 \right) \times 10^{#3}\,\mathrm{m}\,\mathrm{s}^{-1}",
+    r"\sum_{i=1}^{n} \frac{x_i - \bar{x}}{\sigma} = #1, \quad p < #2",
+]
+RENDERS = 10_000
+REPEAT = 5
+
+
+def best_of(function: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best / RENDERS * 1e6
+
+
+def fill(latex: str, values: tuple[str, ...]) -> str:
+    return PARAMETER_PATTERN.sub(lambda match: f"{{{values[int(match.group(1) or match.group(2)) - 1]}}}", latex)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{RENDERS} renders per template, best of {REPEAT}")
+    for latex in TEMPLATES:
+        template = Template(latex)
+        values = [tuple(f"{rng.uniform(-100, 100):.2f}" for _ in range(template.parameters)) for _ in range(RENDERS)]
+        strings = [fill(latex, value) for value in values]
+        converted = best_of(lambda: [convert(string) for string in strings])
+        rendered = best_of(lambda: [template.render(*value) for value in values])
+        print(f"  {latex}")
+        print(f"    convert() {converted:.1f}us, Template.render() {rendered:.1f}us ({converted / rendered:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import time
+from typing import Callable
+
+from corpus import snapshot_formulas
+
+from latex2mathml.tokenizer import tokenize, tokenize_many
+
+FORMULAS = 50_000
+CORPORA = {
+    "1 token": [f"{i}" for i in range(FORMULAS)],
+    "3 tokens": [f"x_{i}" for i in range(FORMULAS)],
+    "13 tokens": [rf"x_{{{i}}} + \frac{{a}}{{{i}}}" for i in range(FORMULAS)],
+    "snapshots": [formula for _ in range(50) for formula in snapshot_formulas()],  # formulas repeat across pages
+}
+REPEAT = 5
+
+
+def best_of(function: Callable[[list[str]], object], latex_strings: list[str]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(latex_strings)
+        best = min(best, time.perf_counter() - start)
+    return best / len(latex_strings) * 1e6
+
+
+def tokenize_each(latex_strings: list[str]) -> list[list[str]]:
+    return [list(tokenize(latex_string)) for latex_string in latex_strings]
+
+
+def main() -> None:
+    print(f"best of {REPEAT}")
+    for label, latex_strings in CORPORA.items():
+        each = best_of(tokenize_each, latex_strings)
+        many = best_of(tokenize_many, latex_strings)
+        print(
+            f"{label:>10}: tokenize() {each:.2f}us/formula, tokenize_many() {many:.2f}us/formula ({each / many:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import mmap
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from latex2mathml.tokenizer import tokenize, tokenize_stream
+
+ROWS = 10_000
+COLUMNS = 20
+LATEX = (
+    r"\begin{bmatrix}"
+    + r" \\ ".join(" & ".join(f"{(r * COLUMNS + c) * 0.5:.3f}" for c in range(COLUMNS)) for r in range(ROWS))
+    + r"\end{bmatrix}"
+)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "matrix.tex"
+        path.write_text(LATEX, encoding="utf-8")
+        print(f"{ROWS}x{COLUMNS} matrix, {path.stat().st_size / 1e6:.1f}MB")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = sum(1 for _ in tokenize(path.read_text(encoding="utf-8")))
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  read + tokenize(): {count} tokens, {elapsed:.2f}s, peak {peak / 1e6:.1f}MB")
+
+        with path.open("rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            tracemalloc.start()
+            start = time.perf_counter()
+            count = sum(1 for _ in tokenize_stream(mapped))
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        print(f"tokenize_stream(mmap): {count} tokens, {elapsed:.2f}s, peak {peak / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import time
+import tracemalloc
+from typing import Callable
+
+from latex2mathml.converter import Converter, convert, convert_to_element
+from latex2mathml.walker import walk
+
+SIZES = (50, 100, 150)
+REPEAT = 3
+
+
+def matrix(size: int) -> str:
+    rows = (" & ".join(f"a_{{{i}{j}}}" for j in range(size)) for i in range(size))
+    return r"\begin{pmatrix}" + r" \\ ".join(rows) + r"\end{pmatrix}"
+
+
+def retained(function: Callable[[], object]) -> float:
+    tracemalloc.start()
+    result = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size / 2**20
+
+
+def peak(function: Callable[[], object]) -> float:
+    tracemalloc.start()
+    function()
+    _, size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / 2**20
+
+
+def best_of(function: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    for size in SIZES:
+        latex = matrix(size)
+        nodes = list(walk(latex))
+        converter = Converter()
+        tree = converter.convert_nodes_to_tree(nodes)
+        compact = retained(lambda: converter.convert_nodes_to_tree(nodes))
+        element = retained(tree.to_element)
+        print(f"{size}x{size} matrix")
+        print(
+            f"  tree: compact {compact:.1f}MB, ElementTree {element:.1f}MB ({(1 - compact / element) * 100:.0f}% less)"
+        )
+        print(f"  convert(): peak {peak(lambda: convert(latex)):.1f}MB, {best_of(lambda: convert(latex)):.0f}ms")
+        elapsed = best_of(lambda: convert_to_element(latex))
+        print(f"  convert_to_element(): peak {peak(lambda: convert_to_element(latex)):.1f}MB, {elapsed:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
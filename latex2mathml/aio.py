@@ -0,0 +1,87 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from typing import AsyncGenerator, Iterable, Optional
+
+from latex2mathml.converter import cached_convert
+
+CONCURRENCY_LIMIT = 32
+
+
+async def aconvert(
+    latex: str,
+    xmlns: str = "http://www.w3.org/1998/Math/MathML",
+    display: str = "inline",
+    executor: Optional[Executor] = None,
+    inline_threshold: int = 0,
+) -> str:
+    """
+    Converts Latex string to MathML without blocking the event loop.
+
+    :param latex: Latex string.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    :param executor: Thread or process executor (default=the event loop's default executor).
+    :param inline_threshold: Latex strings shorter than this are converted on the event loop directly.
+    """
+    if len(latex) < inline_threshold:
+        return cached_convert(latex, xmlns, display)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(cached_convert, latex, xmlns, display))
+
+
+async def aconvert_many(
+    latex_strings: Iterable[str],
+    xmlns: str = "http://www.w3.org/1998/Math/MathML",
+    display: str = "inline",
+    executor: Optional[Executor] = None,
+    limit: int = CONCURRENCY_LIMIT,
+    ordered: bool = True,
+    inline_threshold: int = 0,
+) -> AsyncGenerator[tuple[int, str], None]:
+    """
+    Converts many Latex strings, yielding `(index, mathml)` pairs.
+
+    At most `limit` conversions are in flight, and `latex_strings` is only consumed as results are taken, so a slow
+    consumer applies backpressure. Closing or cancelling the iterator cancels the conversions that have not started.
+
+    :param latex_strings: Latex strings.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    :param executor: Thread or process executor (default=the event loop's default executor).
+    :param limit: Maximum number of conversions in flight.
+    :param ordered: Yield in input order, otherwise yield as conversions complete.
+    :param inline_threshold: Latex strings shorter than this are converted on the event loop directly.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    convert = partial(aconvert, xmlns=xmlns, display=display, executor=executor, inline_threshold=inline_threshold)
+    latex_iterator = iter(enumerate(latex_strings))
+    pending: deque[asyncio.Task] = deque()
+    indexes: dict[asyncio.Task, int] = {}
+
+    def fill() -> None:
+        while len(pending) < limit:
+            item = next(latex_iterator, None)
+            if item is None:
+                return
+            task = asyncio.ensure_future(convert(item[1]))
+            indexes[task] = item[0]
+            pending.append(task)
+
+    try:
+        fill()
+        while pending:
+            if ordered:
+                task = pending.popleft()
+                await task
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                task = next(t for t in pending if t in done)
+                pending.remove(task)
+            yield indexes.pop(task), task.result()
+            fill()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,423 @@
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, Iterator, Optional, TextIO, Union
+
+from latex2mathml.converter import Converter, cached_convert
+from latex2mathml.walker import walk
+
+CHECKPOINT_INTERVAL = 1000
+CHUNK_SIZE = 64
+BACKENDS = ("process", "thread", "interpreter")
+DOCUMENT_EXTENSIONS = (".md", ".html", ".tex")
+QUEUE_SIZE = 128
+MANIFEST_FILE = ".latex2mathml-manifest.json"
+DOCUMENT_MATH_PATTERN = re.compile(
+    r"""
+    \$\$(?P<block_dollar>.+?)\$\$ |
+    \\\[(?P<block_bracket>.+?)\\\] |
+    \\\((?P<inline_paren>.+?)\\\) |
+    (?<!\\)\$(?P<inline_dollar>(?:\\.|[^\\$])+?)\$
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def convert_document(text: str) -> str:
+    """
+    Replaces `$...$`, `\\(...\\)`, `$$...$$` and `\\[...\\]` math in a document with MathML.
+
+    :param text: Document text.
+    """
+
+    def _replace(match: re.Match) -> str:
+        display = "block" if match.lastgroup in ("block_dollar", "block_bracket") else "inline"
+        return cached_convert(match.group(match.lastgroup or 0).strip(), display=display)
+
+    return DOCUMENT_MATH_PATTERN.sub(_replace, text)
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """
+    Parses a shard specification such as `0/4` into `(index, count)`.
+
+    :param shard: Zero-based shard index and shard count separated by `/`.
+    """
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {shard!r}, expected i/n") from None
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard {shard!r}, expected 0 <= i < n")
+    return index, count
+
+
+def in_shard(key: str, shard: Optional[tuple[int, int]]) -> bool:
+    if shard is None:
+        return True
+    index, count = shard
+    return zlib.crc32(key.encode()) % count == index
+
+
+def make_executor(backend: str = "process", jobs: Optional[int] = None) -> Executor:
+    """
+    Creates the worker pool used by batch conversion.
+
+    The `interpreter` backend runs each worker in its own subinterpreter (Python 3.14+), which imports latex2mathml
+    again. Whether its module-level tables and compiled patterns work there unchanged is only checked by
+    `test_make_executor_interpreter`, which cannot run before Python 3.14.
+
+    :param backend: One of `process`, `thread` or `interpreter` (default="process").
+    :param jobs: Number of workers (default=CPU count).
+    """
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=jobs)
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=jobs)
+    if backend == "interpreter":
+        try:
+            from concurrent.futures import InterpreterPoolExecutor  # type: ignore[attr-defined]
+        except ImportError:
+            raise RuntimeError("The interpreter backend requires Python 3.14 or newer") from None
+        return InterpreterPoolExecutor(max_workers=jobs)
+    raise ValueError(f"Invalid backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+
+def file_digest(data: bytes) -> str:
+    import latex2mathml
+
+    return hashlib.sha256(latex2mathml.__version__.encode() + b"\0" + data).hexdigest()
+
+
+def build_file(source: Union[str, Path], destination: Union[str, Path]) -> None:
+    with open(source, encoding="utf-8") as f:
+        text = f.read()
+    Path(destination).parent.mkdir(parents=True, exist_ok=True)
+    with open(destination, "w", encoding="utf-8") as f:
+        f.write(convert_document(text))
+
+
+def build_directory(
+    source: Union[str, Path],
+    destination: Union[str, Path],
+    jobs: Optional[int] = None,
+    shard: Optional[tuple[int, int]] = None,
+    backend: str = "process",
+) -> list[Path]:
+    """
+    Converts the math in every document under `source` into a mirrored tree under `destination`.
+
+    A manifest of content hashes is kept in `destination`, so documents unchanged since the last build are skipped,
+    and the outputs of documents deleted since then are removed.
+
+    :param source: Input directory.
+    :param destination: Output directory.
+    :param jobs: Number of workers (default=CPU count, 1 converts in-process).
+    :param shard: Only build the documents of this `(index, count)` shard.
+    :param backend: Worker pool backend, see `make_executor` (default="process").
+    :return: Relative paths of the documents that were converted.
+    """
+    source, destination = Path(source), Path(destination)
+    manifest_path = destination / MANIFEST_FILE
+    if shard is not None:
+        manifest_path = manifest_path.with_suffix(f".{shard[0]}-of-{shard[1]}.json")
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            previous: dict[str, str] = json.load(f)
+    except FileNotFoundError:
+        previous = {}
+
+    manifest: dict[str, str] = {}
+    pending: dict[Path, str] = {}
+    for path in sorted(source.rglob("*")):
+        if not path.is_file() or path.suffix not in DOCUMENT_EXTENSIONS:
+            continue
+        relative = path.relative_to(source)
+        key = relative.as_posix()
+        if not in_shard(key, shard):
+            continue
+        digest = file_digest(path.read_bytes())
+        if previous.get(key) == digest and (destination / relative).exists():
+            manifest[key] = digest
+        else:
+            pending[relative] = digest
+    for key in previous.keys() - manifest.keys() - {relative.as_posix() for relative in pending}:
+        (destination / key).unlink(missing_ok=True)  # the source was deleted since the last build
+
+    converted: list[Path] = []
+    try:
+        if jobs == 1:
+            for relative, digest in pending.items():
+                build_file(source / relative, destination / relative)
+                manifest[relative.as_posix()] = digest
+                converted.append(relative)
+        elif pending:
+            with make_executor(backend, jobs) as executor:
+                futures = {
+                    relative: executor.submit(build_file, source / relative, destination / relative)
+                    for relative in pending
+                }
+                for relative, future in futures.items():
+                    future.result()
+                    manifest[relative.as_posix()] = pending[relative]
+                    converted.append(relative)
+    finally:
+        destination.mkdir(parents=True, exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    return converted
+
+
+def convert_chunk(latex_strings: list[str], display: str = "inline") -> list[str]:
+    return [cached_convert(latex, display=display) for latex in latex_strings]
+
+
+def convert_records(
+    records: Iterable[tuple[Any, str]],
+    display: str = "inline",
+    shard: Optional[tuple[int, int]] = None,
+    skip: Optional[set[str]] = None,
+    executor: Optional[Executor] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[Any, str]]:
+    """
+    Converts `(id, latex)` records, yielding `(id, mathml)` in input order.
+
+    :param records: Iterable of `(id, latex)` pairs.
+    :param display: Display mode (default="inline").
+    :param shard: Only convert the records of this `(index, count)` shard, partitioned by `str(id)`.
+    :param skip: Record IDs (as strings) that were already converted.
+    :param executor: Executor to convert chunks of records in (default=convert in the calling thread).
+    :param chunk_size: Number of records sent to the executor per task.
+    """
+    selected = (
+        (record_id, latex)
+        for record_id, latex in records
+        if in_shard(str(record_id), shard) and (skip is None or str(record_id) not in skip)
+    )
+    if executor is None:
+        for record_id, latex in selected:
+            yield record_id, cached_convert(latex, display=display)
+        return
+
+    max_pending = 2 * (os.cpu_count() or 1)
+    pending: deque[tuple[list[Any], Future]] = deque()
+    while True:
+        chunk = list(islice(selected, chunk_size))
+        if chunk:
+            ids = [record_id for record_id, _ in chunk]
+            pending.append((ids, executor.submit(convert_chunk, [latex for _, latex in chunk], display)))
+        if pending and (not chunk or len(pending) >= max_pending):
+            ids, future = pending.popleft()
+            yield from zip(ids, future.result())
+        elif not chunk:
+            return
+
+
+def read_checkpoint(path: Union[str, Path]) -> tuple[set[str], int]:
+    """
+    Reads the completed record IDs and the last committed output offset from a checkpoint file.
+
+    :param path: Checkpoint file written by `convert_batch`.
+    """
+    completed: set[str] = set()
+    offset = 0
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:  # partially written entry after a crash
+                    break
+                completed.update(entry["ids"])
+                offset = entry["offset"]
+    except FileNotFoundError:
+        pass
+    return completed, offset
+
+
+def convert_batch(
+    source: Union[str, Path],
+    destination: Union[str, Path],
+    display: str = "inline",
+    shard: Optional[tuple[int, int]] = None,
+    checkpoint: Optional[Union[str, Path]] = None,
+    resume: bool = False,
+    jobs: Optional[int] = None,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+    backend: str = "process",
+) -> int:
+    """
+    Converts a JSON Lines file of `{"id": ..., "latex": ...}` records into a JSON Lines file of
+    `{"id": ..., "mathml": ...}` records.
+
+    Every `checkpoint_interval` records, the output is flushed and the completed IDs are appended to `checkpoint`
+    together with the output size. Resuming truncates the output to the last checkpoint and skips the completed IDs.
+
+    :param source: Input JSON Lines file.
+    :param destination: Output JSON Lines file.
+    :param display: Display mode (default="inline").
+    :param shard: Only convert the records of this `(index, count)` shard.
+    :param checkpoint: Checkpoint file (default=no checkpointing).
+    :param resume: Continue from `checkpoint` instead of starting over.
+    :param jobs: Number of workers (default=CPU count, 1 converts in-process).
+    :param checkpoint_interval: Number of records between checkpoints.
+    :param backend: Worker pool backend, see `make_executor` (default="process").
+    :return: Number of records converted by this run.
+    """
+    completed: set[str] = set()
+    offset = 0
+    if resume and checkpoint is not None:
+        completed, offset = read_checkpoint(checkpoint)
+    elif checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    executor = None if jobs == 1 else make_executor(backend, jobs)
+    count = 0
+    try:
+        with (
+            open(source, encoding="utf-8") as input_file,
+            open(destination, "r+" if offset else "w", encoding="utf-8") as output_file,
+        ):
+            output_file.seek(offset)
+            output_file.truncate()
+            records = ((record["id"], record["latex"]) for record in map(json.loads, filter(str.strip, input_file)))
+            batch: list[str] = []
+            for record_id, mathml in convert_records(records, display, shard, completed, executor):
+                output_file.write(json.dumps({"id": record_id, "mathml": mathml}, ensure_ascii=False) + "\n")
+                batch.append(str(record_id))
+                count += 1
+                if checkpoint is not None and len(batch) >= checkpoint_interval:
+                    _write_checkpoint(checkpoint, batch, output_file)
+                    batch = []
+            if checkpoint is not None and batch:
+                _write_checkpoint(checkpoint, batch, output_file)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return count
+
+
+def _write_checkpoint(path: Union[str, Path], ids: list[str], output_file: TextIO) -> None:
+    output_file.flush()
+    os.fsync(output_file.fileno())
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"ids": ids, "offset": output_file.tell()}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class StageStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.elapsed = 0.0
+
+    @property
+    def utilization(self) -> float:
+        return self.busy / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return f"{self.name}: {self.items} items, {self.busy:.3f}s busy, {self.utilization:.0%} utilization"
+
+
+_DONE = object()
+
+
+class Pipeline:
+    """
+    Converts a stream of Latex strings with tokenizing/walking, conversion to elements and serialization running in
+    separate threads connected by bounded queues. Per-stage statistics are kept in `stats`.
+
+    :param display: Display mode (default="inline").
+    :param queue_size: Maximum number of items waiting between two stages.
+    """
+
+    def __init__(self, display: str = "inline", queue_size: int = QUEUE_SIZE) -> None:
+        self.display = display
+        self.queue_size = queue_size
+        self.stats: list[StageStats] = []
+
+    def convert(self, latex_strings: Iterable[str]) -> Generator[str, None, None]:
+        stages: list[tuple[str, Callable[[Any], Any]]] = [
+            ("walk", lambda latex: walk(latex, self.display)),
+            ("convert", lambda nodes: Converter(display=self.display).convert_nodes_to_tree(nodes)),
+            ("serialize", Converter().serialize),
+        ]
+        self.stats = [StageStats(name) for name, _ in stages]
+        stop = threading.Event()
+        threads = []
+        items: Iterator[Any] = iter(latex_strings)
+        for (_, function), stats in zip(stages, self.stats):
+            output: queue.Queue = queue.Queue(maxsize=self.queue_size)
+            thread = threading.Thread(target=self._run_stage, args=(function, items, output, stats, stop), daemon=True)
+            thread.start()
+            threads.append(thread)
+            items = self._drain(output, stop)
+        try:
+            for item in items:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    @staticmethod
+    def _run_stage(
+        function: Callable[[Any], Any],
+        items: Iterator[Any],
+        output: queue.Queue,
+        stats: StageStats,
+        stop: threading.Event,
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                if not isinstance(item, Exception):
+                    busy = time.perf_counter()
+                    try:
+                        item = function(item)
+                    except Exception as e:
+                        item = e
+                    stats.busy += time.perf_counter() - busy
+                stats.items += 1
+                Pipeline._put(output, item, stop)
+        except Exception as e:  # raised by the input iterable
+            Pipeline._put(output, e, stop)
+        finally:
+            Pipeline._put(output, _DONE, stop)
+            stats.elapsed = time.perf_counter() - start
+
+    @staticmethod
+    def _put(output: queue.Queue, item: Any, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    @staticmethod
+    def _drain(source: queue.Queue, stop: threading.Event) -> Iterator[Any]:
+        while not stop.is_set():
+            try:
+                item = source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+            yield item
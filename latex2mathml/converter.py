@@ -1,12 +1,18 @@
 import copy
 import enum
+import io
 import re
-from typing import Iterable, Iterator, Optional
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.sax.saxutils import unescape
+import sys
+from functools import lru_cache
+from itertools import accumulate
+from typing import IO, Callable, Iterable, Iterator, Optional, Union, cast
+from xml.etree import ElementTree
 
-from latex2mathml import commands
-from latex2mathml.symbols_parser import convert_symbol
+from latex2mathml import commands, fonts, speech
+from latex2mathml.optimizer import optimize as optimize_tree
+from latex2mathml.symbols_parser import REFERENCE_PATTERN, convert_symbol, decode_references
+from latex2mathml.tokenizer import COMMAND, DIMENSION, FONT, NUMBER, OPERATORNAME, kind_of
+from latex2mathml.tree import Element, SubElement
 from latex2mathml.walker import MULTIPRIMES, Node, walk
 
 COLUMN_ALIGNMENT_MAP = {"r": "right", "l": "left", "c": "center"}
@@ -59,8 +65,20 @@ OPERATORS = frozenset(
         r"\varsupsetneqq",
     )
 )
+ASCII = "ascii"
+NUMERIC = "numeric"
+UNICODE = "unicode"
+OUTPUT_ENCODINGS = (NUMERIC, UNICODE, ASCII)
+NAMESPACE_ATTRIBUTE = "attribute"
+NAMESPACE_QUALIFIED = "qualified"
+NAMESPACE_NONE = "none"
+NAMESPACE_STRATEGIES = (NAMESPACE_ATTRIBUTE, NAMESPACE_QUALIFIED, NAMESPACE_NONE)
+CACHE_SIZE = 4096
+STREAM_BUFFER_SIZE = 1024
+EQUATION_PLACEHOLDER = "(\ufffc)"
 MATH_MODE_PATTERN = re.compile(r"\\\$|\$|\\?[^\\$]+")
 NUMBER_PATTERN = re.compile(r"\d+(\.\d+)?")
+NON_ASCII_PATTERN = re.compile(r"[^\x00-\x7f]")
 MOVABLE_LIMIT_TEXTS = {
     commands.ARGMAX: "arg&#x02009;max",
     commands.ARGMIN: "arg&#x02009;min",
@@ -86,30 +104,201 @@ class Mode(enum.Enum):
 
 
 class Converter:
-    def __init__(self, xmlns: str = "http://www.w3.org/1998/Math/MathML", display: str = "inline") -> None:
+    def __init__(
+        self,
+        xmlns: str = "http://www.w3.org/1998/Math/MathML",
+        display: str = "inline",
+        equation_counter: int = 0,
+        equation_placeholders: bool = False,
+        output_encoding: str = NUMERIC,
+        optimize: bool = False,
+        alttext: bool = False,
+        annotation: bool = False,
+        speech: bool = False,
+        math_alphanumerics: bool = False,
+    ) -> None:
+        if output_encoding not in OUTPUT_ENCODINGS:
+            raise ValueError(f"Unknown output encoding: {output_encoding}")
         self.xmlns = xmlns
         self.display = display
-        self.equation_counter = 0
+        self.equation_counter = equation_counter
+        self.equation_placeholders = equation_placeholders
+        self.output_encoding = output_encoding
+        self.optimize = optimize
+        self.alttext = alttext
+        self.annotation = annotation
+        self.speech = speech
+        self.math_alphanumerics = math_alphanumerics
+        self.speech_text: Optional[str] = None
         self.macros: dict[str, tuple[list[str], int]] = {}
+        self._words: Optional[list[str]] = None
+        self._placeholders: list[Element] = []  # equation number placeholders of the last conversion
+
+    def convert(self, latex: str, parent: Optional[ElementTree.Element] = None) -> str:
+        tree = self.convert_to_tree(latex)
+        if parent is not None:
+            tree.to_element(parent)
+        return self.serialize(tree)
+
+    def convert_bytes(
+        self, latex: Union[bytes, bytearray, memoryview], parent: Optional[ElementTree.Element] = None
+    ) -> bytes:
+        """
+        Converts UTF-8 encoded Latex to UTF-8 encoded MathML. The serializer output is encoded in chunks of
+        `STREAM_BUFFER_SIZE` pieces, so no MathML string is built.
+        """
+        tree = self.convert_to_tree(str(latex, "utf-8"))
+        if parent is not None:
+            tree.to_element(parent)
+        chunks: list[bytes] = []
+        self._write_chunks(tree, lambda text: chunks.append(text.encode()))
+        return b"".join(chunks)
+
+    def write(self, latex: str, fp: Union[IO[str], IO[bytes]]) -> None:
+        """
+        Converts Latex string to MathML and writes it to `fp` in chunks while the tree is serialized, without building
+        the MathML string. The whole tree is built first, so memory still grows with the formula. Binary files get
+        UTF-8.
+        """
+        tree = self.convert_to_tree(latex)
+        flush: Callable[[str], object]
+        if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(fp, "mode", ""):
+            binary = cast(IO[bytes], fp)
+
+            def flush(text: str) -> None:
+                binary.write(text.encode())
 
-    def convert(self, latex: str, parent: Optional[Element] = None) -> str:
-        return self._convert(self.convert_to_element(latex, parent))
+        else:
+            flush = cast(IO[str], fp).write
+        self._write_chunks(tree, flush)
+
+    def _write_chunks(self, tree: Element, flush: Callable[[str], object]) -> None:
+        parts: list[str] = []
+
+        def write(text: str) -> None:  # one flush per `STREAM_BUFFER_SIZE` parts instead of one per tag or text
+            parts.append(text)
+            if len(parts) >= STREAM_BUFFER_SIZE:
+                flush("".join(parts))
+                parts.clear()
 
-    def convert_to_element(self, latex: str, parent: Optional[Element] = None) -> Element:
-        tag = "math"
-        attrib = {"xmlns": self.xmlns, "display": self.display}
-        math = Element(tag, attrib) if parent is None else SubElement(parent, tag, attrib)
-        row = SubElement(math, "mrow")
-        self._convert_group(iter(walk(latex, self.display, macros=self.macros)), row)
-        return math
+        self.write_tree(tree, write)
+        flush("".join(parts))
+
+    def convert_to_element(self, latex: str, parent: Optional[ElementTree.Element] = None) -> ElementTree.Element:
+        return self.convert_to_tree(latex).to_element(parent)
+
+    def convert_nodes_to_element(
+        self, nodes: Iterable[Node], parent: Optional[ElementTree.Element] = None
+    ) -> ElementTree.Element:
+        return self.convert_nodes_to_tree(nodes).to_element(parent)
 
     def reset(self) -> None:
         self.equation_counter = 0
         self.macros = {}
 
+    def convert_to_tree(self, latex: str) -> Element:
+        """
+        Converts Latex string to a `<math>` tree of `latex2mathml.tree.Element`s, which `serialize()` writes as MathML
+        and `Element.to_element()` copies into `xml.etree.ElementTree` elements. Texts hold character references.
+        """
+        return self.convert_nodes_to_tree(walk(latex, self.display, macros=self.macros), latex)
+
+    def convert_nodes_to_tree(self, nodes: Iterable[Node], latex: Optional[str] = None) -> Element:
+        """
+        Converts nodes to a `<math>` tree. With the `alttext` and `annotation` options, `latex` is added as the
+        `alttext` attribute and as an `application/x-tex` annotation, and with the `speech` option the words of each
+        symbol and command are collected while the tree is built and joined into `speech_text`.
+        """
+        math = Element("math", {"xmlns": self.xmlns, "display": self.display})
+        if self.alttext and latex is not None:
+            math.set("alttext", _escape_text(latex))
+        semantics = SubElement(math, "semantics") if self.annotation and latex is not None else math
+        row = SubElement(semantics, "mrow")
+        self._words = [] if self.speech else None
+        self._placeholders = []
+        self._convert_group(iter(nodes), row)
+        if self._words is not None:
+            self.speech_text = " ".join(" ".join(self._words).split())
+            self._words = None
+        if semantics is not math and latex is not None:
+            SubElement(semantics, "annotation", encoding="application/x-tex").text = _escape_text(latex)
+        return optimize_tree(math) if self.optimize else math
+
+    def serialize(self, tree: Union[Element, ElementTree.Element]) -> str:
+        """
+        Returns the MathML of a tree from `convert_to_tree()`, or of any of its elements, in the output encoding.
+        """
+        parts: list[str] = []
+        self.write_tree(tree, parts.append)
+        return "".join(parts)
+
+    def write_tree(self, tree: Union[Element, ElementTree.Element], write: Callable[[str], object]) -> None:
+        """
+        Writes the MathML of a tree like `serialize()`, in pieces, to a callable such as `list.append` or `fp.write`.
+        """
+        Converter._serialize(tree, write, _TEXT_ENCODERS[self.output_encoding])
+
+    def split_equation_numbers(self, tree: Union[Element, ElementTree.Element]) -> list[str]:
+        """
+        Returns the MathML of a tree like `serialize()`, split around the equation number placeholders of the last
+        conversion with `equation_placeholders`, so that the numbers go between the pieces.
+        """
+        placeholders = {id(element) for element in self._placeholders}
+        pieces: list[str] = []
+        parts: list[str] = []
+        skip = False
+
+        def write(text: str) -> None:
+            nonlocal skip
+            if skip:
+                skip = False
+            else:
+                parts.append(text)
+
+        def mark(element: Union[Element, ElementTree.Element]) -> None:
+            nonlocal skip
+            if id(element) in placeholders:  # the same text in `\text{}` is not a placeholder
+                pieces.append("".join(parts))
+                parts.clear()
+                skip = True
+
+        Converter._serialize(tree, write, _TEXT_ENCODERS[self.output_encoding], mark)
+        pieces.append("".join(parts))
+        return pieces
+
     @staticmethod
-    def _convert(tree: Element) -> str:
-        return unescape(tostring(tree, encoding="unicode"))
+    def _serialize(
+        element: Union[Element, ElementTree.Element],
+        write: Callable[[str], object],
+        encode: Optional[Callable[[str], str]] = None,
+        mark: Optional[Callable[[Union[Element, ElementTree.Element]], object]] = None,
+    ) -> None:
+        """
+        Writes an element like `unescape(tostring(element, encoding="unicode"))`: text is written as is, as it already
+        holds the character references of the symbols, and only the attribute escapes that `unescape` keeps are applied.
+        `encode` rewrites each text and attribute value for the output encoding on the way, and `mark` is called with
+        each element right before its text is written.
+        """
+        tag = element.tag
+        write("<" + tag)
+        for name, value in element.items():
+            if encode is not None:
+                value = encode(value)
+            write(f' {name}="{_escape_attribute(value)}"')
+        text = element.text
+        if text or len(element):
+            write(">")
+            if text:
+                if mark is not None:
+                    mark(element)
+                write(text if encode is None else encode(text))
+            for child in element:
+                Converter._serialize(child, write, encode, mark)
+            write("</" + tag + ">")
+        else:
+            write(" />")
+        if element.tail:
+            write(element.tail if encode is None else encode(element.tail))
 
     def _convert_matrix(
         self, nodes: Iterator[Node], parent: Element, command: str, alignment: Optional[str] = None
@@ -129,6 +318,7 @@ class Converter:
 
         numbered = command == commands.ALIGN
         skip_number = False
+        tag: Optional[Node] = None
 
         for node in nodes:
             if row is None:
@@ -139,8 +329,10 @@ class Converter:
                 cell = self._make_matrix_cell(row, col_alignment)
 
             if node.token == commands.BRACES:
-                self._convert_group(iter([node]), cell)
+                self._convert_cell_node(node, cell)
             elif node.token == "&":
+                if self._words is not None and command not in (commands.SPLIT, commands.ALIGN, commands.ALIGNSTAR):
+                    self._words.append("next cell")
                 self._set_cell_alignment(cell, hfil_indexes)
                 hfil_indexes = []
                 col_alignment, col_index = self._get_column_alignment(alignment, col_alignment, col_index)
@@ -148,14 +340,13 @@ class Converter:
                 if command in (commands.SPLIT, commands.ALIGN, commands.ALIGNSTAR) and col_index % 2 == 0:
                     SubElement(cell, "mi")
             elif node.token in (commands.DOUBLEBACKSLASH, commands.CARRIAGERETURN):
+                if self._words is not None:
+                    self._words.append("next row")
                 self._set_cell_alignment(cell, hfil_indexes)
                 hfil_indexes = []
-                if numbered and not skip_number:
-                    self.equation_counter += 1
-                    eqn_cell = SubElement(row, "mtd")
-                    eqn_num = SubElement(eqn_cell, "mtext")
-                    eqn_num.text = f"({self.equation_counter})"
+                self._append_equation_number(row, tag, numbered and not skip_number)
                 skip_number = False
+                tag = None
                 row_index += 1
                 if col_index > max_col_size:
                     max_col_size = col_index
@@ -165,6 +356,8 @@ class Converter:
                 cell = self._make_matrix_cell(row, col_alignment)
             elif node.token in (commands.NONUMBER, commands.NOTAG):
                 skip_number = True
+            elif node.token in (commands.TAG, commands.TAGSTAR) and command in (commands.ALIGN, commands.ALIGNSTAR):
+                tag = node
             elif node.token == commands.HLINE:
                 row_lines.append("solid")
             elif node.token == commands.HDASHLINE:
@@ -175,7 +368,7 @@ class Converter:
                 if row_index > len(row_lines):
                     row_lines.append("none")
                 hfil_indexes.append(False)
-                self._convert_group(iter([node]), cell)
+                self._convert_cell_node(node, cell)
 
         if col_index > max_col_size:
             max_col_size = col_index
@@ -183,21 +376,34 @@ class Converter:
         if any(r != "none" for r in row_lines):
             parent.set("rowlines", " ".join(row_lines))
 
-        if row is not None and cell is not None and len(cell) == 0:
+        if row is not None and cell is not None and len(cell) == 0 and tag is None:
             parent.remove(row)
             row = None
 
-        if numbered and row is not None and not skip_number:
-            self.equation_counter += 1
-            eqn_cell = SubElement(row, "mtd")
-            eqn_num = SubElement(eqn_cell, "mtext")
-            eqn_num.text = f"({self.equation_counter})"
+        if row is not None:
+            self._append_equation_number(row, tag, numbered and not skip_number)
 
         if max_col_size and command in (commands.ALIGN, commands.ALIGNSTAR):
             spacing = ("0em", "2em")
             multiplier = max_col_size // len(spacing)
             parent.set("columnspacing", " ".join(spacing * multiplier))
 
+    def _convert_cell_node(self, node: Node, cell: Element) -> None:
+        self._convert_group(iter([node]), cell)
+
+    def _append_equation_number(self, row: Element, tag: Optional[Node], numbered: bool) -> None:
+        if tag is not None:
+            self._convert_command(tag, SubElement(row, "mtd"))
+        elif numbered:
+            self.equation_counter += 1
+            eqn_cell = SubElement(row, "mtd")
+            eqn_num = SubElement(eqn_cell, "mtext")
+            if self.equation_placeholders:
+                eqn_num.text = EQUATION_PLACEHOLDER
+                self._placeholders.append(eqn_num)
+            else:
+                eqn_num.text = f"({self.equation_counter})"
+
     def _convert_group(
         self, nodes: Iterable[Node], parent: Element, font: Optional[dict[str, Optional[str]]] = None
     ) -> None:
@@ -217,6 +423,8 @@ class Converter:
                     code = ""
                 element = SubElement(parent, "mi")
                 element.text = f"&#x{code.lstrip('x')};"
+                if self._words is not None:
+                    self._words.append(speech.symbol_words(element.text))
             elif token == commands.RULE:
                 attrs = node.attributes or {}
                 SubElement(parent, "mspace", mathbackground="black", width=attrs["width"], height=attrs["height"])
@@ -224,7 +432,7 @@ class Converter:
                 self._convert_command(node, parent, _font)
             elif token in commands.LOCAL_FONTS and node.children is not None:
                 self._convert_group(iter(node.children), parent, commands.LOCAL_FONTS[token])
-            elif token.startswith(commands.MATH) and node.children is not None:
+            elif node.children is not None and kind_of(token) == FONT:
                 self._convert_group(iter(node.children), parent, _font)
             elif token in commands.GLOBAL_FONTS.keys():
                 _font = commands.GLOBAL_FONTS.get(token)
@@ -283,6 +491,9 @@ class Converter:
             tag = "munderover"
 
         element = SubElement(parent, tag, attributes)
+        words = self._words
+        if words is not None and command in speech.WORDS:
+            words.append(speech.WORDS[command])
 
         if command in commands.LIMIT:
             element.text = command[1:]
@@ -306,6 +517,8 @@ class Converter:
         elif node.text is not None:
             if command == commands.MIDDLE:
                 element.text = "&#x{};".format(convert_symbol(node.text))
+                if words is not None:
+                    words.append(speech.symbol_words(node.text))
             elif command == commands.HBOX:
                 mtext: Optional[Element] = element
                 for text, mode in self._separate_by_mode(node.text):
@@ -315,6 +528,8 @@ class Converter:
                         mtext.text = text.replace(" ", "&#x000A0;")
                         self._set_font(mtext, "mtext", font)
                         mtext = None
+                        if words is not None:
+                            words.append(text)
                     else:
                         _row = SubElement(parent, "mrow")
                         self._convert_group(iter(walk(text, macros=self.macros)), _row)
@@ -335,10 +550,14 @@ class Converter:
                 else:
                     element.text = node.text.replace(" ", "&#x000A0;")
                 self._set_font(element, "mtext", font)
+                if words is not None:
+                    words.append(node.text)
         elif node.delimiter is not None and command not in (commands.FRAC, commands.GENFRAC):
             if node.delimiter != ".":
                 symbol = convert_symbol(node.delimiter)
                 element.text = node.delimiter if symbol is None else "&#x{};".format(symbol)
+                if words is not None:
+                    words.append(speech.symbol_words(node.delimiter, symbol))
 
         if node.children is not None:
             _parent = element
@@ -372,6 +591,8 @@ class Converter:
                     ),
                 )
                 self._convert_group(iter([new_node]), _parent, font)
+            elif words is not None and command in speech.TEMPLATES:
+                self._convert_arguments(node.children, _parent, font, speech.TEMPLATES[command], words)
             elif command in commands.EXTENSIBLE_ARROWS:
                 for child in node.children:
                     padded = SubElement(
@@ -397,10 +618,36 @@ class Converter:
 
         self._append_delimiter_element(node, parent, is_prefix=False)
 
+    def _convert_arguments(
+        self,
+        arguments: tuple[Node, ...],
+        parent: Element,
+        font: Optional[dict[str, Optional[str]]],
+        template: tuple[Union[str, int], ...],
+        words: list[str],
+    ) -> None:
+        """
+        Converts the arguments of a command like `_convert_group()` does, and replaces the words spoken for them by the
+        words of the command filled with them, e.g. `fraction a over b end fraction`.
+        """
+        starts: list[int] = []
+
+        def mark(nodes: Iterable[Node]) -> Iterator[Node]:
+            for node in nodes:
+                starts.append(len(words))
+                yield node
+
+        start = len(words)
+        self._convert_group(mark(arguments), parent, font)
+        ends = [*starts[1:], len(words)]
+        spoken = [" ".join(words[begin:end]) for begin, end in zip(starts, ends)]
+        if len(spoken) > max(part for part in template if isinstance(part, int)):
+            words[start:] = [speech.fill(template, spoken)]
+
     def _append_delimiter_element(self, node: Node, parent: Element, is_prefix: bool) -> None:
         delimiter_index = 0 if is_prefix else 1
         size = "2.047em"
-        if parent.attrib.get("displaystyle") == "false" or node.token == commands.TBINOM:
+        if parent.get("displaystyle") == "false" or node.token == commands.TBINOM:
             size = "1.2em"
         if node.token in (r"\pmatrix", commands.PMOD, commands.POD):
             self._convert_and_append_command(r"\lparen" if is_prefix else r"\rparen", parent)
@@ -435,8 +682,13 @@ class Converter:
             count = int(node.text or "0")
             element = SubElement(parent, "mi", attrib=attributes)
             element.text = "&#x02032;" * count
+            if self._words is not None:
+                self._words.append(" ".join(["prime"] * count))
             return
-        if NUMBER_PATTERN.match(token):
+        if self._words is not None:
+            self._words.append(speech.symbol_words(token, symbol))
+        kind = kind_of(token)
+        if kind in (NUMBER, DIMENSION):
             element = SubElement(parent, "mn", attrib=attributes)
             element.text = token
             self._set_font(element, element.tag, font)
@@ -511,14 +763,14 @@ class Converter:
             self._set_font(mi_t, mi_t.tag, font)
             self._set_font(mi_e, mi_e.tag, font)
             self._set_font(mi_x, mi_x.tag, font)
-        elif token.startswith(commands.OPERATORNAME):
+        elif kind == OPERATORNAME:
             for prefix in (commands.OPERATORNAMEWITHLIMITS, commands.OPERATORNAMESTAR, commands.OPERATORNAME):
                 if token.startswith(prefix):
                     attrib = {"movablelimits": "true", **attributes} if prefix != commands.OPERATORNAME else attributes
                     element = SubElement(parent, "mo", attrib=attrib)
                     element.text = token[len(prefix) + 1 : -1]
                     break
-        elif token.startswith(commands.BACKSLASH):
+        elif kind == COMMAND:
             element = SubElement(parent, "mi", attrib=attributes)
             if symbol:
                 element.text = "&#x{};".format(symbol)
@@ -532,12 +784,16 @@ class Converter:
             element.text = token
             self._set_font(element, element.tag, font)
 
-    @staticmethod
-    def _set_font(element: Element, key: str, font: Optional[dict[str, Optional[str]]]) -> None:
+    def _set_font(self, element: Element, key: str, font: Optional[dict[str, Optional[str]]]) -> None:
         if font is None:
             return
         _font = font[key]
         if _font is not None:
+            if self.math_alphanumerics and key != "mtext" and element.text:  # text keeps plain letters
+                styled = fonts.style(element.text, _font)
+                if styled is not None:
+                    element.text = styled
+                    return
             element.attrib["mathvariant"] = _font
 
     @staticmethod
@@ -610,18 +866,291 @@ def convert(
     latex: str,
     xmlns: str = "http://www.w3.org/1998/Math/MathML",
     display: str = "inline",
-    parent: Optional[Element] = None,
+    parent: Optional[ElementTree.Element] = None,
+    equation_counter: int = 0,
+    output_encoding: str = NUMERIC,
+    optimize: bool = False,
+    math_alphanumerics: bool = False,
 ) -> str:
-    return Converter(xmlns=xmlns, display=display).convert(latex, parent=parent)
+    converter = _make_converter(xmlns, display, equation_counter, output_encoding, optimize, math_alphanumerics)
+    return converter.convert(latex, parent=parent)
+
+
+def convert_bytes(
+    latex: Union[bytes, bytearray, memoryview],
+    xmlns: str = "http://www.w3.org/1998/Math/MathML",
+    display: str = "inline",
+    parent: Optional[ElementTree.Element] = None,
+    equation_counter: int = 0,
+    output_encoding: str = NUMERIC,
+    optimize: bool = False,
+    math_alphanumerics: bool = False,
+) -> bytes:
+    """
+    Converts UTF-8 encoded Latex to UTF-8 encoded MathML, the same as `convert(latex.decode()).encode()` but encoded
+    by the serializer in chunks instead of through a MathML string.
+
+    :param latex: UTF-8 encoded Latex string.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    :param parent: Parent element.
+    :param equation_counter: Number of `align` equations numbered before this one.
+    :param output_encoding: Symbols as `NUMERIC` character references (default), as `UNICODE` characters except
+        `<`, `&` and `>`, or `ASCII` with a reference for every other character.
+    :param optimize: Remove redundant `mrow` elements, see `latex2mathml.optimizer.optimize()` (default=False).
+    :param math_alphanumerics: Write letters and digits of `\\mathbf{}` and other fonts as Mathematical Alphanumeric
+        Symbols such as `&#x1D41A;` instead of `mathvariant` attributes where Unicode has them (default=False).
+    """
+    converter = _make_converter(xmlns, display, equation_counter, output_encoding, optimize, math_alphanumerics)
+    return converter.convert_bytes(latex, parent=parent)
+
+
+def convert_to_stream(
+    latex: str,
+    fp: Union[IO[str], IO[bytes]],
+    xmlns: str = "http://www.w3.org/1998/Math/MathML",
+    display: str = "inline",
+    equation_counter: int = 0,
+    output_encoding: str = NUMERIC,
+    optimize: bool = False,
+    math_alphanumerics: bool = False,
+) -> None:
+    """
+    Converts Latex string to MathML and writes it to `fp` in chunks while the tree is serialized, without building the
+    MathML string. This is not streaming: the whole tree is built first, so memory still grows with the formula, and
+    only the output string is saved. Binary files get UTF-8.
+
+    :param latex: Latex string.
+    :param fp: Writable text or binary file object.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    :param equation_counter: Number of `align` equations numbered before this one.
+    :param output_encoding: `NUMERIC`, `UNICODE` or `ASCII`, see `convert_bytes()`.
+    :param optimize: Remove redundant `mrow` elements (default=False).
+    :param math_alphanumerics: Write styled letters and digits as Mathematical Alphanumeric Symbols, see
+        `convert_bytes()` (default=False).
+    """
+    converter = _make_converter(xmlns, display, equation_counter, output_encoding, optimize, math_alphanumerics)
+    converter.write(latex, fp)
 
 
 def convert_to_element(
     latex: str,
     xmlns: str = "http://www.w3.org/1998/Math/MathML",
     display: str = "inline",
-    parent: Optional[Element] = None,
-) -> Element:
-    return Converter(xmlns=xmlns, display=display).convert_to_element(latex, parent=parent)
+    parent: Optional[ElementTree.Element] = None,
+    equation_counter: int = 0,
+    optimize: bool = False,
+    math_alphanumerics: bool = False,
+) -> ElementTree.Element:
+    converter = _make_converter(xmlns, display, equation_counter, NUMERIC, optimize, math_alphanumerics)
+    return converter.convert_to_element(latex, parent=parent)
+
+
+def _make_converter(
+    xmlns: str, display: str, equation_counter: int, output_encoding: str, optimize: bool, math_alphanumerics: bool
+) -> Converter:
+    return Converter(
+        xmlns=xmlns,
+        display=display,
+        equation_counter=equation_counter,
+        output_encoding=output_encoding,
+        optimize=optimize,
+        math_alphanumerics=math_alphanumerics,
+    )
+
+
+def _escape_text(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&#x00026;")
+    if "<" in text:
+        text = text.replace("<", "&#x0003C;")
+    if ">" in text:
+        text = text.replace(">", "&#x0003E;")
+    return text
+
+
+def _escape_attribute(value: str) -> str:
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+def _unicode_character(match: re.Match) -> str:
+    code_point = int(match.group(1), 16)
+    if code_point > sys.maxunicode:
+        return match.group()
+    character = chr(code_point)
+    return match.group() if character in "<&>" else character
+
+
+def _encode_unicode(text: str) -> str:
+    return REFERENCE_PATTERN.sub(_unicode_character, text) if "&#x" in text else text
+
+
+def _encode_ascii(text: str) -> str:
+    return text if text.isascii() else NON_ASCII_PATTERN.sub(lambda match: f"&#x{ord(match.group()):05X};", text)
+
+
+_TEXT_ENCODERS: dict[str, Optional[Callable[[str], str]]] = {
+    NUMERIC: None,
+    UNICODE: _encode_unicode,
+    ASCII: _encode_ascii,
+}
+
+
+def convert_many_to_element(
+    latex_strings: Iterable[str],
+    parent: ElementTree.Element,
+    xmlns: str = "http://www.w3.org/1998/Math/MathML",
+    display: str = "inline",
+    namespace: str = NAMESPACE_ATTRIBUTE,
+    optimize: bool = False,
+) -> list[ElementTree.Element]:
+    """
+    Converts Latex strings of one document with one `Converter`, so macros and equation numbers carry over from one
+    string to the next, and appends their `<math>` elements to `parent`. The text holds characters instead of character
+    references, so the page can be serialized with `ElementTree.tostring()` once all formulas are appended. The
+    `<math>` elements share one attribute dict, so changing the attributes of one changes them all.
+
+    :param latex_strings: Latex strings in document order.
+    :param parent: Element to append the `<math>` elements to.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    :param namespace: How the namespace is written: an `xmlns` attribute on every `<math>` element
+        (`NAMESPACE_ATTRIBUTE`, default), namespace-qualified tags such as `{xmlns}math`, for which `ElementTree`
+        declares a prefix once on the element it serializes (`NAMESPACE_QUALIFIED`), or not at all, for HTML
+        (`NAMESPACE_NONE`).
+    :param optimize: Remove redundant `mrow` elements (default=False).
+    :return: The appended `<math>` elements.
+    """
+    if namespace not in NAMESPACE_STRATEGIES:
+        raise ValueError(f"Unknown namespace strategy: {namespace}")
+    converter = Converter(xmlns=xmlns, display=display, optimize=optimize)
+    attrib = {"xmlns": xmlns, "display": display} if namespace == NAMESPACE_ATTRIBUTE else {"display": display}
+    qualified = xmlns if namespace == NAMESPACE_QUALIFIED else None
+    tag = "math" if qualified is None else f"{{{qualified}}}math"
+    elements = []
+    for latex in latex_strings:
+        tree = converter.convert_to_tree(latex)
+        math = ElementTree.SubElement(parent, tag)
+        math.attrib = attrib
+        for child in tree:
+            child.to_element(math, qualified, decode_references)
+        elements.append(math)
+    return elements
+
+
+def count_equations(
+    latex: str, display: str = "inline", macros: Optional[dict[str, tuple[list[str], int]]] = None
+) -> int:
+    """
+    Counts the automatically numbered `align` rows of a Latex string without converting it.
+
+    :param latex: Latex string.
+    :param display: Display mode (default="inline").
+    :param macros: Macros defined by previous Latex strings of the same document, updated in place.
+    """
+    return _count_equations(walk(latex, display, macros=macros))
+
+
+def equation_counters(latex_strings: Iterable[str], display: str = "inline") -> list[int]:
+    """
+    Computes the starting `equation_counter` of each Latex string of a document, so the strings can be converted
+    independently (e.g. in parallel) and still be numbered as if converted in order by one `Converter`.
+
+    :param latex_strings: Latex strings in document order.
+    :param display: Display mode (default="inline").
+    """
+    macros: dict[str, tuple[list[str], int]] = {}
+    counts = [count_equations(latex, display, macros=macros) for latex in latex_strings]
+    return [0, *accumulate(counts)][:-1]
+
+
+def convert_with_equation_index(
+    latex: str,
+    xmlns: str = "http://www.w3.org/1998/Math/MathML",
+    display: str = "inline",
+    parent: Optional[ElementTree.Element] = None,
+) -> tuple[str, list[int]]:
+    """
+    Converts Latex string to MathML with placeholders instead of automatic equation numbers.
+
+    :param latex: Latex string.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    :param parent: Parent element.
+    :return: MathML with placeholders and the offsets of the placeholders, to be passed to `renumber_equations`.
+    """
+    converter = Converter(xmlns=xmlns, display=display, equation_placeholders=True)
+    tree = converter.convert_to_tree(latex)
+    if parent is not None:
+        tree.to_element(parent)
+    pieces = converter.split_equation_numbers(tree)
+    index: list[int] = []
+    offset = 0
+    for piece in pieces[:-1]:
+        offset += len(piece)
+        index.append(offset)
+        offset += len(EQUATION_PLACEHOLDER)
+    return EQUATION_PLACEHOLDER.join(pieces), index
+
+
+def renumber_equations(mathml: str, index: list[int], equation_counter: int = 0) -> str:
+    """
+    Replaces the equation number placeholders of `convert_with_equation_index` output with numbers.
+
+    :param mathml: MathML with placeholders.
+    :param index: Offsets of the placeholders.
+    :param equation_counter: Number of equations before this MathML in the document.
+    """
+    parts = []
+    start = 0
+    for number, position in enumerate(index, start=equation_counter + 1):
+        parts.append(mathml[start:position])
+        parts.append(f"({number})")
+        start = position + len(EQUATION_PLACEHOLDER)
+    parts.append(mathml[start:])
+    return "".join(parts)
+
+
+def _count_equations(nodes: Iterable[Node]) -> int:
+    count = 0
+    for node in nodes:
+        if node.children is None:
+            continue
+        count += _count_equations(node.children)
+        if node.token != commands.ALIGN:
+            continue
+        has_content = skip_number = has_tag = False
+        cell_index = 1
+        for child in node.children:
+            if child.token in (commands.DOUBLEBACKSLASH, commands.CARRIAGERETURN):
+                count += not (skip_number or has_tag)
+                has_content = skip_number = has_tag = False
+                cell_index = 1
+            elif child.token == "&":
+                cell_index += 1
+                has_content = cell_index % 2 == 0  # empty `mi` placeholder in even cells
+            elif child.token in (commands.NONUMBER, commands.NOTAG):
+                skip_number = True
+            elif child.token in (commands.TAG, commands.TAGSTAR):
+                has_tag = True
+            elif child.token not in (commands.HLINE, commands.HDASHLINE, commands.HFIL, *commands.GLOBAL_FONTS):
+                has_content = True
+        count += has_content and not (skip_number or has_tag)
+    return count
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def cached_convert(latex: str, xmlns: str = "http://www.w3.org/1998/Math/MathML", display: str = "inline") -> str:
+    return convert(latex, xmlns=xmlns, display=display)
 
 
 def main() -> None:  # pragma: no cover
@@ -631,6 +1160,9 @@ def main() -> None:  # pragma: no cover
     parser = argparse.ArgumentParser(description="Pure Python library for LaTeX to MathML conversion")
     parser.add_argument("-V", "--version", dest="version", action="store_true", required=False, help="Show version")
     parser.add_argument("-b", "--block", dest="block", action="store_true", required=False, help="Display block")
+    parser.add_argument(
+        "-o", "--output", dest="output", type=str, required=False, help="Output file, or directory with -d"
+    )
 
     required = parser.add_argument_group("required arguments")
 
@@ -638,6 +1170,22 @@ def main() -> None:  # pragma: no cover
     group.add_argument("-t", "--text", dest="text", type=str, required=False, help="Text")
     group.add_argument("-f", "--file", dest="file", type=str, required=False, help="File")
     group.add_argument("-s", "--stdin", dest="stdin", action="store_true", required=False, help="Stdin")
+    group.add_argument("-d", "--directory", dest="directory", type=str, required=False, help="Input directory")
+    group.add_argument("-r", "--records", dest="records", type=str, required=False, help="Input JSON Lines records")
+
+    batch = parser.add_argument_group("batch arguments")
+    batch.add_argument("-j", "--jobs", dest="jobs", type=int, required=False, help="Number of workers")
+    batch.add_argument(
+        "--backend",
+        dest="backend",
+        choices=("process", "thread", "interpreter"),
+        default="process",
+        required=False,
+        help="Worker pool backend",
+    )
+    batch.add_argument("--shard", dest="shard", type=str, required=False, help="Zero-based shard i/n to convert")
+    batch.add_argument("--checkpoint", dest="checkpoint", type=str, required=False, help="Checkpoint file")
+    batch.add_argument("--resume", dest="resume", action="store_true", required=False, help="Resume from checkpoint")
 
     arguments = parser.parse_args()
     display = "block" if arguments.block else "inline"
@@ -650,9 +1198,41 @@ def main() -> None:  # pragma: no cover
         print(convert(arguments.text, display=display))
     elif arguments.file:
         with open(arguments.file) as f:
-            print(convert(f.read(), display=display))
+            latex = f.read()
+        if arguments.output:
+            with open(arguments.output, "w", encoding="utf-8") as f:
+                convert_to_stream(latex, f, display=display)
+        else:
+            convert_to_stream(latex, sys.stdout, display=display)
+            print()
     elif arguments.stdin:
         print(convert(sys.stdin.read(), display=display))
+    elif arguments.directory or arguments.records:
+        from latex2mathml.batch import build_directory, convert_batch, parse_shard
+
+        if not arguments.output:
+            parser.error("the following arguments are required: -o/--output")
+        try:
+            shard = parse_shard(arguments.shard) if arguments.shard else None
+        except ValueError as e:
+            parser.error(str(e))
+        if arguments.directory:
+            paths = build_directory(
+                arguments.directory, arguments.output, jobs=arguments.jobs, shard=shard, backend=arguments.backend
+            )
+            for path in paths:
+                print(path)
+        else:
+            convert_batch(
+                arguments.records,
+                arguments.output,
+                display=display,
+                shard=shard,
+                checkpoint=arguments.checkpoint or f"{arguments.output}.checkpoint",
+                resume=arguments.resume,
+                jobs=arguments.jobs,
+                backend=arguments.backend,
+            )
 
 
 if __name__ == "__main__":  # pragma: no cover
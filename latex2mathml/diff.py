@@ -0,0 +1,147 @@
+from typing import Iterable, NamedTuple, Optional, Union, cast
+from xml.etree.ElementTree import Element
+
+from latex2mathml.converter import Converter
+from latex2mathml.symbols_parser import decode_references
+
+INSERT = "insert"
+REMOVE = "remove"
+REPLACE = "replace"
+SET_ATTRIBUTE = "set_attribute"
+SET_TEXT = "set_text"
+
+
+class Patch(NamedTuple):
+    """
+    A DOM update addressed by a path of child indexes from the `<math>` element. Patches are applied in order, and
+    each path refers to the tree as left by the previous patches.
+    """
+
+    operation: str
+    path: tuple[int, ...]
+    value: Union[Element, str, None] = None  # subtree to insert, text, or attribute value (`None` removes it)
+    name: Optional[str] = None  # attribute name
+
+
+def diff(old: Element, new: Element) -> list[Patch]:
+    """
+    Returns the patches that turn `old` into `new`.
+
+    :param old: Previous MathML tree.
+    :param new: New MathML tree.
+    """
+    patches: list[Patch] = []
+    _diff(old, new, (), patches)
+    return patches
+
+
+def convert_to_patches(
+    latex: str, previous: Element, xmlns: str = "http://www.w3.org/1998/Math/MathML", display: str = "inline"
+) -> tuple[Element, list[Patch]]:
+    """
+    Converts Latex string to a MathML tree and the patches that turn `previous` into it.
+
+    :param latex: Latex string.
+    :param previous: MathML tree of the previous conversion.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    """
+    element = Converter(xmlns=xmlns, display=display).convert_to_element(latex)
+    return element, diff(previous, element)
+
+
+def apply_patches(element: Element, patches: Iterable[Patch]) -> Element:
+    """
+    Applies patches to a MathML tree in place and returns the tree, which is a new element if the root was replaced.
+
+    :param element: MathML tree.
+    :param patches: Patches from `diff()`.
+    """
+    for patch in patches:
+        if not patch.path:
+            element = cast(Element, patch.value)
+            continue
+        parent = element
+        for index in patch.path[:-1]:
+            parent = parent[index]
+        index = patch.path[-1]
+        if patch.operation == INSERT:
+            parent.insert(index, cast(Element, patch.value))
+        elif patch.operation == REMOVE:
+            del parent[index]
+        elif patch.operation == REPLACE:
+            parent[index] = cast(Element, patch.value)
+        elif patch.operation == SET_ATTRIBUTE:
+            if patch.value is None:
+                parent[index].attrib.pop(cast(str, patch.name), None)
+            else:
+                parent[index].set(cast(str, patch.name), str(patch.value))
+        elif patch.operation == SET_TEXT:
+            parent[index].text = None if patch.value is None else str(patch.value)
+        else:
+            raise ValueError(f"Unknown patch operation: {patch.operation}")
+    return element
+
+
+def serialize_patches(patches: Iterable[Patch]) -> list[dict]:
+    """
+    Returns JSON-serializable patches, with subtrees as MathML strings, and texts and attribute values with characters
+    instead of character references, ready for `textContent` and `setAttribute()`.
+
+    :param patches: Patches from `diff()`.
+    """
+    result = []
+    converter = Converter()
+    for patch in patches:
+        item: dict = {"op": patch.operation, "path": list(patch.path)}
+        if patch.name is not None:
+            item["name"] = patch.name
+        if isinstance(patch.value, Element):
+            item["value"] = converter.serialize(patch.value)
+        elif patch.operation != REMOVE:
+            item["value"] = None if patch.value is None else decode_references(patch.value)
+        result.append(item)
+    return result
+
+
+def _equal(a: Element, b: Element) -> bool:
+    return (
+        a.tag == b.tag
+        and a.text == b.text
+        and a.attrib == b.attrib
+        and len(a) == len(b)
+        and all(_equal(x, y) for x, y in zip(a, b))
+    )
+
+
+def _diff(old: Element, new: Element, path: tuple[int, ...], patches: list[Patch]) -> None:
+    if old.tag != new.tag:
+        patches.append(Patch(REPLACE, path, new))
+        return
+    for name in old.attrib.keys() - new.attrib.keys():
+        patches.append(Patch(SET_ATTRIBUTE, path, None, name))
+    for name, value in new.attrib.items():
+        if old.get(name) != value:
+            patches.append(Patch(SET_ATTRIBUTE, path, value, name))
+    if old.text != new.text:
+        patches.append(Patch(SET_TEXT, path, new.text))
+
+    old_children, new_children = list(old), list(new)
+    size = min(len(old_children), len(new_children))
+    prefix = 0
+    while prefix < size and _equal(old_children[prefix], new_children[prefix]):
+        prefix += 1
+    suffix = 0
+    while suffix < size - prefix and _equal(old_children[-1 - suffix], new_children[-1 - suffix]):
+        suffix += 1
+    old_middle = old_children[prefix : len(old_children) - suffix]
+    new_middle = new_children[prefix : len(new_children) - suffix]
+
+    for i, (old_child, new_child) in enumerate(zip(old_middle, new_middle), start=prefix):
+        _diff(old_child, new_child, (*path, i), patches)
+    if len(new_middle) > len(old_middle):
+        for i in range(prefix + len(old_middle), prefix + len(new_middle)):
+            patches.append(Patch(INSERT, (*path, i), new_children[i]))
+    else:
+        for i in reversed(range(prefix + len(new_middle), prefix + len(old_middle))):
+            patches.append(Patch(REMOVE, (*path, i)))
@@ -0,0 +1,63 @@
+from typing import Any, Callable, Union
+from xml.etree import ElementTree
+from xml.sax.xmlreader import AttributesImpl
+
+from latex2mathml.converter import Converter
+from latex2mathml.symbols_parser import decode_references
+from latex2mathml.tree import Element
+
+
+def convert_to_events(
+    latex: str,
+    target: Any,
+    xmlns: str = "http://www.w3.org/1998/Math/MathML",
+    display: str = "inline",
+    equation_counter: int = 0,
+    optimize: bool = False,
+) -> Any:
+    """
+    Converts Latex string to MathML and sends it to `target` as start, text and end events, the same events a parser
+    would send for the MathML string `convert()` returns, without the string. Character references are sent as the
+    characters they stand for, and `xmlns` as an attribute.
+
+    `target` is an `xml.sax.handler.ContentHandler`, which gets `startDocument()`, `startElement()`, `characters()`,
+    `endElement()` and `endDocument()`, or an `xml.etree.ElementTree.TreeBuilder`-compatible object such as
+    `lxml.etree.TreeBuilder`, which gets `start()`, `data()` and `end()`, and whose `close()` result is returned.
+
+    :param latex: Latex string.
+    :param target: SAX content handler or tree builder.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    :param equation_counter: Number of `align` equations numbered before this one.
+    :param optimize: Remove redundant `mrow` elements (default=False).
+    """
+    converter = Converter(xmlns=xmlns, display=display, equation_counter=equation_counter, optimize=optimize)
+    element = converter.convert_to_tree(latex)
+    if hasattr(target, "startElement"):
+        target.startDocument()
+        _emit(
+            element,
+            lambda tag, attrib: target.startElement(tag, AttributesImpl(attrib)),
+            target.characters,
+            target.endElement,
+        )
+        target.endDocument()
+        return None
+    _emit(element, target.start, target.data, target.end)
+    return target.close()
+
+
+def _emit(
+    element: Union[Element, ElementTree.Element],
+    start: Callable[[str, dict[str, str]], object],
+    data: Callable[[str], object],
+    end: Callable[[str], object],
+) -> None:
+    start(element.tag, dict(element.items()))
+    if element.text:
+        data(decode_references(element.text))
+    for child in element:
+        _emit(child, start, data, end)
+    end(element.tag)
+    if element.tail:
+        data(decode_references(element.tail))
@@ -0,0 +1,89 @@
+import string
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+from latex2mathml.symbols_parser import decode_references
+
+# `mathvariant` values and their names in the Mathematical Alphanumeric Symbols block
+VARIANTS = {
+    "bold": "BOLD",
+    "italic": "ITALIC",
+    "bold-italic": "BOLD ITALIC",
+    "script": "SCRIPT",
+    "bold-script": "BOLD SCRIPT",
+    "fraktur": "FRAKTUR",
+    "bold-fraktur": "BOLD FRAKTUR",
+    "double-struck": "DOUBLE-STRUCK",
+    "sans-serif": "SANS-SERIF",
+    "bold-sans-serif": "SANS-SERIF BOLD",
+    "sans-serif-italic": "SANS-SERIF ITALIC",
+    "sans-serif-bold-italic": "SANS-SERIF BOLD ITALIC",
+    "monospace": "MONOSPACE",
+}
+
+# letters encoded in the Letterlike Symbols block, which are left out of the Mathematical Alphanumeric Symbols block
+LETTERLIKE = {
+    "italic": {"h": "ℎ"},
+    "script": {
+        "B": "ℬ",
+        "E": "ℰ",
+        "F": "ℱ",
+        "H": "ℋ",
+        "I": "ℐ",
+        "L": "ℒ",
+        "M": "ℳ",
+        "R": "ℛ",
+        "e": "ℯ",
+        "g": "ℊ",
+        "o": "ℴ",
+    },
+    "fraktur": {"C": "ℭ", "H": "ℌ", "I": "ℑ", "R": "ℜ", "Z": "ℨ"},
+    "double-struck": {
+        "C": "ℂ",
+        "H": "ℍ",
+        "N": "ℕ",
+        "P": "ℙ",
+        "Q": "ℚ",
+        "R": "ℝ",
+        "Z": "ℤ",
+    },
+}
+
+GREEK = "".join(chr(code) for code in (*range(0x391, 0x3AA), *range(0x3B1, 0x3CA)) if code != 0x3A2)
+
+
+@lru_cache(maxsize=None)
+def math_alphanumerics(variant: str) -> dict[str, str]:
+    """
+    Returns the styled character references of a `mathvariant` by plain letter and digit, built on first use.
+
+    :param variant: Key of `VARIANTS`.
+    """
+    table = {}
+    for character in string.ascii_letters + string.digits + GREEK:
+        name = unicodedata.name(character).replace("LATIN ", "").replace("GREEK ", "").replace(" LETTER", "")
+        try:
+            styled = unicodedata.lookup(f"MATHEMATICAL {VARIANTS[variant]} {name}")
+        except KeyError:
+            styled = LETTERLIKE.get(variant, {}).get(character, "")
+        if styled:
+            table[character] = "&#x{:05X};".format(ord(styled))
+    return table
+
+
+def style(text: str, mathvariant: str) -> Optional[str]:
+    """
+    Returns text with its letters and digits replaced by the Mathematical Alphanumeric Symbols of `mathvariant`, as
+    character references, or `None` if the variant has no table or a character has no styled form.
+
+    :param text: Element text, with character references.
+    :param mathvariant: `mathvariant` attribute value, e.g. `bold`.
+    """
+    if mathvariant not in VARIANTS or not text:
+        return None
+    table = math_alphanumerics(mathvariant)
+    try:
+        return "".join([table[character] for character in decode_references(text)])
+    except KeyError:
+        return None
@@ -0,0 +1,276 @@
+from typing import NamedTuple, Optional
+
+from latex2mathml import commands
+from latex2mathml.converter import Converter
+from latex2mathml.tokenizer import PATTERN
+from latex2mathml.tree import Element
+from latex2mathml.walker import Node, walk
+
+MACRO_DEFINITIONS = (commands.NEWCOMMAND, commands.DEF, commands.DECLAREMATHOPERATOR, commands.NEWENVIRONMENT)
+POSTFIX_PREFIXES = (commands.SUBSCRIPT, commands.SUPERSCRIPT, commands.APOSTROPHE)  # `^2` and `_1` are single tokens
+POSTFIX_COMMANDS = (commands.LIMITS, commands.NOLIMITS)
+ROW_SEPARATORS = (commands.DOUBLEBACKSLASH, commands.CARRIAGERETURN)
+
+
+class _Token(NamedTuple):
+    start: int
+    end: int
+    token: str
+
+
+class _Row(NamedTuple):
+    before: int  # start of the token preceding the row
+    start: int
+    end: int
+    nodes: tuple[Node, ...]
+
+    def shift(self, delta: int) -> "_Row":
+        return self._replace(before=self.before + delta, start=self.start + delta, end=self.end + delta)
+
+
+class _Environment(NamedTuple):
+    position: int  # index of the environment node in the top-level nodes
+    rows: list[_Row]
+    separators: list[Node]
+
+
+class _MemoConverter(Converter):
+    def __init__(self, xmlns: str, display: str, memo: dict[int, tuple[Node, list[Element]]]) -> None:
+        super().__init__(xmlns=xmlns, display=display)
+        self.previous_memo = memo
+        self.memo: dict[int, tuple[Node, list[Element]]] = {}
+
+    def _convert_cell_node(self, node: Node, cell: Element) -> None:
+        cached = self.previous_memo.get(id(node))
+        if cached is not None and cached[0] is node:
+            cell.extend(cached[1])
+            self.memo[id(node)] = cached
+            return
+        size, equation_counter = len(cell), self.equation_counter
+        super()._convert_cell_node(node, cell)
+        if self.equation_counter == equation_counter:
+            self.memo[id(node)] = (node, list(cell)[size:])
+
+
+class Session:
+    """
+    Keeps the walked tree and the converted matrix cells of a Latex string, so edits inside a row of a top-level
+    matrix environment (`align`, `matrix`, `array`, ...) only re-tokenize and re-walk that row and only convert the
+    cells that changed. Any other edit falls back to a full conversion.
+
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    """
+
+    def __init__(self, xmlns: str = "http://www.w3.org/1998/Math/MathML", display: str = "inline") -> None:
+        self.xmlns = xmlns
+        self.display = display
+        self.latex = ""
+        self.nodes: list[Node] = []
+        self.environments: list[_Environment] = []
+        self._memo: dict[int, tuple[Node, list[Element]]] = {}
+
+    def convert(self, latex: str) -> str:
+        """
+        Converts a new Latex string, replacing the current one.
+
+        :param latex: Latex string.
+        """
+        self.nodes = walk(latex, self.display)
+        self.latex = latex
+        self.environments = self._find_environments()
+        return self._render()
+
+    def edit(self, offset: int, removed: int, inserted: str) -> str:
+        """
+        Applies an edit to the current Latex string and returns the new MathML.
+
+        :param offset: Offset of the edit in the current Latex string.
+        :param removed: Number of characters removed at `offset`.
+        :param inserted: Text inserted at `offset`.
+        """
+        if offset < 0 or removed < 0 or offset + removed > len(self.latex):
+            raise IndexError("Edit is out of range")
+        latex = self.latex[:offset] + inserted + self.latex[offset + removed :]
+        if not self._edit_row(latex, offset, removed, len(inserted) - removed):
+            return self.convert(latex)
+        self.latex = latex
+        return self._render()
+
+    def _render(self) -> str:
+        converter = _MemoConverter(self.xmlns, self.display, self._memo)
+        mathml = converter.convert_nodes_to_tree(self.nodes)
+        self._memo = converter.memo
+        return converter.serialize(mathml)
+
+    def _edit_row(self, latex: str, offset: int, removed: int, delta: int) -> bool:
+        for e, environment in enumerate(self.environments):
+            for r, row in enumerate(environment.rows):
+                if row.start <= offset and offset + removed <= row.end:
+                    break
+            else:
+                continue
+            break
+        else:
+            return False
+
+        end = row.end + delta
+        tokens = _scan(latex, row.before, end)
+        if not tokens or tokens[0].end != row.start:
+            return False
+        tokens = tokens[1:]
+        if not _is_closed(tokens) or (tokens and _is_postfix(tokens[0].token)):
+            return False
+        if r == 0 and tokens and tokens[0].token in (commands.OPENING_BRACKET, commands.OPENING_BRACE):
+            return False  # the walker may read it as a column alignment preamble, see `_preamble_length()`
+        separator = environment.separators[r] if r < len(environment.separators) else Node(commands.DOUBLEBACKSLASH)
+        try:
+            # a newline ends a trailing comment, and no token of a closed row reaches past it
+            nodes = walk(f"{latex[row.start : end]}\n{separator.token}", self.display, macros={})
+        except Exception:  # let the full conversion raise
+            return False
+        if not nodes or nodes[-1] != separator:
+            return False
+
+        rows = list(environment.rows)
+        rows[r] = _Row(row.before, row.start, end, tuple(nodes[:-1]))
+        for i in range(r + 1, len(rows)):
+            rows[i] = rows[i].shift(delta)
+        children = list(rows[0].nodes)
+        for separator_node, next_row in zip(environment.separators, rows[1:]):
+            children.append(separator_node)
+            children.extend(next_row.nodes)
+        self.nodes[environment.position] = self.nodes[environment.position]._replace(children=tuple(children))
+        self.environments[e] = environment._replace(rows=rows)
+        for i in range(e + 1, len(self.environments)):
+            self.environments[i] = self.environments[i]._replace(
+                rows=[_row.shift(delta) for _row in self.environments[i].rows]
+            )
+        return True
+
+    def _find_environments(self) -> list[_Environment]:
+        tokens = _scan(self.latex, 0, len(self.latex))
+        # an unterminated `\verb` can take text from the rows after it once an edit adds its closing delimiter
+        if not tokens or any(t.token in MACRO_DEFINITIONS or t.token.startswith(commands.VERB) for t in tokens):
+            return []
+
+        blocks: list[tuple[int, int, bool]] = []  # (start, end, is_environment) token ranges of top-level blocks
+        position = depth = 0
+        begin: Optional[int] = None
+        for i, token in enumerate(tokens):
+            if depth == 0 and token.token.startswith(commands.BEGIN):
+                name = token.token[len(commands.BEGIN) + 1 : -1]
+                begin = i if rf"\{name}" in commands.MATRICES else None
+            depth += _depth_change(token.token)
+            if depth == 0 and begin is not None and token.token.startswith(commands.END):
+                if i + 1 == len(tokens) or not _is_postfix(tokens[i + 1].token):
+                    blocks.extend(((position, begin, False), (begin, i + 1, True)))
+                    position = i + 1
+                begin = None
+        blocks.append((position, len(tokens), False))
+
+        nodes: list[Node] = []
+        environments: list[_Environment] = []
+        try:
+            for start, end, is_environment in blocks:
+                if start == end:
+                    continue
+                text = self.latex[tokens[start].start : tokens[end - 1].end]
+                walked = walk(text, self.display, macros={})
+                if is_environment:
+                    found = self._split_rows(tokens[start:end], walked, len(nodes))
+                    if found is not None:
+                        environments.append(found)
+                nodes.extend(walked)
+        except Exception:
+            return []
+        if nodes != self.nodes:
+            return []
+        self.nodes = nodes  # share the nodes kept in the rows
+        return environments
+
+    @staticmethod
+    def _split_rows(tokens: list[_Token], walked: list[Node], index: int) -> Optional[_Environment]:
+        node = walked[0] if len(walked) == 1 else None
+        if node is None or node.children is None:
+            return None
+        children = node.children
+        interior = tokens[1:-1]
+        preamble = _preamble_length(interior, node)
+        if preamble is None:
+            return None
+        before = tokens[preamble]  # `\begin{...}` or the last token of the preamble
+        boundaries = [(before.start, before.end)]
+        depth = 0
+        for token in interior[preamble:]:
+            if depth == 0 and token.token in ROW_SEPARATORS:
+                boundaries.append((token.start, token.end))
+            depth += _depth_change(token.token)
+        boundaries.append((tokens[-1].start, tokens[-1].end))
+
+        separators = [child for child in children if child.token in ROW_SEPARATORS and child.children is None]
+        if len(separators) != len(boundaries) - 2:
+            return None
+        rows: list[_Row] = []
+        current: list[Node] = []
+        for child in (*children, None):
+            if child is None or (child.token in ROW_SEPARATORS and child.children is None):
+                previous, following = boundaries[len(rows)], boundaries[len(rows) + 1]
+                rows.append(_Row(previous[0], previous[1], following[0], tuple(current)))
+                current = []
+            else:
+                current.append(child)
+        return _Environment(index, rows, separators)
+
+
+def _scan(latex: str, start: int, end: int) -> Optional[list[_Token]]:
+    """
+    Returns the tokens between `start` and `end`, or `None` if a token crosses `end`.
+    """
+    tokens: list[_Token] = []
+    for match in PATTERN.finditer(latex, start):
+        if match.start() >= end:
+            break
+        if match.end() > end:
+            return None
+        tokens.append(_Token(match.start(), match.end(), "".join(match.group().split())))
+    return tokens
+
+
+def _depth_change(token: str) -> int:
+    if token in (commands.OPENING_BRACE, commands.LEFT) or token.startswith(commands.BEGIN):
+        return 1
+    if token in (commands.CLOSING_BRACE, commands.RIGHT) or token.startswith(commands.END):
+        return -1
+    return 0
+
+
+def _is_postfix(token: str) -> bool:
+    return token.startswith(POSTFIX_PREFIXES) or token in POSTFIX_COMMANDS
+
+
+def _is_closed(tokens: list[_Token]) -> bool:
+    depth = 0
+    for token in tokens:
+        if token.token.startswith(("%", commands.VERB)) or token.token in MACRO_DEFINITIONS:
+            return False
+        if depth == 0 and token.token in ROW_SEPARATORS:
+            return False
+        depth += _depth_change(token.token)
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+def _preamble_length(tokens: list[_Token], node: Node) -> Optional[int]:
+    """
+    Returns the number of tokens of the column alignment preamble (`[r]` or `{cr}`), matching what the walker removed.
+    """
+    if node.alignment:
+        for i, token in enumerate(tokens):
+            if token.token in (commands.CLOSING_BRACKET, commands.CLOSING_BRACE):
+                return i + 1
+        return None
+    if tokens and tokens[0].token in (commands.OPENING_BRACKET, commands.OPENING_BRACE):
+        return None  # an empty preamble, or a first cell that looks like one
+    return 0
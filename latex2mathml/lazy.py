@@ -0,0 +1,47 @@
+from typing import Optional
+
+from latex2mathml.converter import cached_convert
+
+
+class LazyMathML:
+    """
+    A Latex string that is converted to MathML only when it is rendered, by `str()` or by a template engine calling
+    `__html__()` (Jinja2, MarkupSafe, Django). The MathML comes from `cached_convert()`, so formulas repeated across
+    objects are converted once, and is kept on the object, so rendering it again costs nothing. Formulas that are never
+    rendered are never converted.
+
+    :param latex: Latex string.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    """
+
+    __slots__ = ("latex", "xmlns", "display", "_mathml")
+
+    def __init__(self, latex: str, xmlns: str = "http://www.w3.org/1998/Math/MathML", display: str = "inline") -> None:
+        self.latex = latex
+        self.xmlns = xmlns
+        self.display = display
+        self._mathml: Optional[str] = None
+
+    @property
+    def converted(self) -> bool:
+        return self._mathml is not None
+
+    def __str__(self) -> str:
+        if self._mathml is None:
+            self._mathml = cached_convert(self.latex, self.xmlns, self.display)
+        return self._mathml
+
+    def __html__(self) -> str:
+        return str(self)
+
+    def __repr__(self) -> str:
+        return f"LazyMathML({self.latex!r}, display={self.display!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LazyMathML):
+            return NotImplemented
+        return (self.latex, self.xmlns, self.display) == (other.latex, other.xmlns, other.display)
+
+    def __hash__(self) -> int:
+        return hash((self.latex, self.xmlns, self.display))
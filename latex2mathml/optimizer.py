@@ -0,0 +1,45 @@
+from typing import TypeVar
+from xml.etree import ElementTree
+
+from latex2mathml.tree import Element
+
+T = TypeVar("T", Element, ElementTree.Element)
+
+# elements that treat their children as one inferred `mrow`
+INFERRED_MROW_ELEMENTS = frozenset(
+    ("math", "menclose", "merror", "mpadded", "mphantom", "mrow", "msqrt", "mstyle", "mtd")
+)
+
+
+def optimize(element: T) -> T:
+    """
+    Removes redundant `mrow` elements from a MathML tree in place and returns the tree. An `mrow` with a single child
+    is replaced by the child, and an `mrow` inside an element that already groups its children like an `mrow` is
+    replaced by its own children. Groups that change how operators are spaced are kept: a lone `mo` in braces (`{-}`),
+    and a braced group holding an `mo` among other children. `mrow`s with attributes and empty `mrow`s are kept too.
+
+    :param element: MathML tree.
+    """
+    _optimize(element)
+    return element
+
+
+def _optimize(element: T) -> None:
+    children = list(element)
+    if not children:
+        return
+    inferred = element.tag in INFERRED_MROW_ELEMENTS
+    optimized: list[T] = []
+    for child in children:
+        _optimize(child)
+        while _is_plain_row(child) and len(child) == 1 and child[0].tag != "mo":
+            child = child[0]
+        if inferred and _is_plain_row(child) and (len(children) == 1 or all(item.tag != "mo" for item in child)):
+            optimized.extend(child)
+        else:
+            optimized.append(child)
+    element[:] = optimized
+
+
+def _is_plain_row(element: T) -> bool:
+    return element.tag == "mrow" and not element.items() and not element.text and len(element) > 0
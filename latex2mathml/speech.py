@@ -0,0 +1,179 @@
+import sys
+import unicodedata
+from typing import Optional, Union
+
+from latex2mathml import commands
+from latex2mathml.symbols_parser import REFERENCE_PATTERN
+
+# words for symbols and commands, an empty string for those that are not spoken
+WORDS = {
+    "+": "plus",
+    "-": "minus",
+    "=": "equals",
+    "<": "less than",
+    ">": "greater than",
+    "(": "open paren",
+    ")": "close paren",
+    "[": "open bracket",
+    "]": "close bracket",
+    r"\{": "open brace",
+    r"\}": "close brace",
+    r"\lbrace": "open brace",
+    r"\rbrace": "close brace",
+    r"\langle": "open angle bracket",
+    r"\rangle": "close angle bracket",
+    "|": "vertical bar",
+    r"\|": "double vertical bar",
+    ",": "comma",
+    ";": "semicolon",
+    ":": "colon",
+    ".": "dot",
+    "/": "slash",
+    "*": "asterisk",
+    "!": "factorial",
+    "'": "prime",
+    r"\&": "and",
+    r"\%": "percent",
+    r"\$": "dollar",
+    r"\#": "number sign",
+    r"\prime": "prime",
+    r"\dprime": "double prime",
+    r"\trprime": "triple prime",
+    r"\qprime": "quadruple prime",
+    r"\times": "times",
+    r"\cdot": "times",
+    r"\div": "divided by",
+    r"\pm": "plus or minus",
+    r"\mp": "minus or plus",
+    r"\le": "less than or equal to",
+    r"\leq": "less than or equal to",
+    r"\ge": "greater than or equal to",
+    r"\geq": "greater than or equal to",
+    r"\ne": "not equal to",
+    r"\neq": "not equal to",
+    r"\approx": "approximately equals",
+    r"\equiv": "is equivalent to",
+    r"\sim": "similar to",
+    r"\propto": "proportional to",
+    r"\infty": "infinity",
+    r"\sum": "sum",
+    r"\prod": "product",
+    r"\int": "integral",
+    r"\iint": "double integral",
+    r"\iiint": "triple integral",
+    r"\oint": "contour integral",
+    r"\lim": "limit",
+    r"\sup": "supremum",
+    r"\inf": "infimum",
+    r"\max": "max",
+    r"\min": "min",
+    r"\to": "right arrow",
+    r"\rightarrow": "right arrow",
+    r"\leftarrow": "left arrow",
+    r"\gets": "left arrow",
+    r"\Rightarrow": "implies",
+    r"\implies": "implies",
+    r"\Leftrightarrow": "if and only if",
+    r"\iff": "if and only if",
+    r"\mapsto": "maps to",
+    r"\in": "element of",
+    r"\notin": "not an element of",
+    r"\subset": "subset of",
+    r"\subseteq": "subset of or equal to",
+    r"\cup": "union",
+    r"\cap": "intersection",
+    r"\emptyset": "empty set",
+    r"\varnothing": "empty set",
+    r"\forall": "for all",
+    r"\exists": "there exists",
+    r"\neg": "not",
+    r"\lnot": "not",
+    r"\not": "not",
+    r"\land": "and",
+    r"\wedge": "and",
+    r"\lor": "or",
+    r"\vee": "or",
+    r"\dots": "dots",
+    r"\ldots": "dots",
+    r"\cdots": "dots",
+    r"\vdots": "dots",
+    r"\ddots": "dots",
+    r"\hat": "hat",
+    r"\widehat": "hat",
+    r"\bar": "bar",
+    r"\overline": "overline",
+    r"\underline": "underline",
+    r"\vec": "vector",
+    r"\dot": "dot",
+    r"\ddot": "double dot",
+    r"\tilde": "tilde",
+    r"\widetilde": "tilde",
+    r"\mod": "mod",
+    r"\bmod": "mod",
+    r"\pmod": "mod",
+    r"\matrix": "matrix",
+    r"\pmatrix": "matrix",
+    r"\bmatrix": "matrix",
+    r"\Bmatrix": "matrix",
+    r"\vmatrix": "determinant",
+    r"\Vmatrix": "matrix",
+    r"\smallmatrix": "matrix",
+    r"\cases": "cases",
+    r"\ ": "",
+    "~": "",
+    r"\nobreakspace": "",
+    r"\space": "",
+    r"\mathstrut": "",
+    r"\strut": "",
+}
+
+# spoken order of the arguments of structural commands, by argument index
+TEMPLATES: dict[str, tuple[Union[str, int], ...]] = {
+    commands.FRAC: ("fraction", 0, "over", 1, "end fraction"),
+    commands.DFRAC: ("fraction", 0, "over", 1, "end fraction"),
+    commands.TFRAC: ("fraction", 0, "over", 1, "end fraction"),
+    commands.BINOM: ("binomial", 0, "choose", 1, "end binomial"),
+    commands.DBINOM: ("binomial", 0, "choose", 1, "end binomial"),
+    commands.TBINOM: ("binomial", 0, "choose", 1, "end binomial"),
+    commands.SQRT: ("square root of", 0, "end root"),
+    commands.ROOT: ("root index", 1, "of", 0, "end root"),
+    commands.SUPERSCRIPT: (0, "superscript", 1, "end superscript"),
+    commands.SUBSCRIPT: (0, "subscript", 1, "end subscript"),
+    commands.SUBSUP: (0, "subscript", 1, "superscript", 2, "end scripts"),
+    commands.OVERSET: (0, "with", 1, "above"),
+    commands.UNDERSET: (0, "with", 1, "below"),
+}
+
+
+def symbol_words(token: str, symbol: Optional[str] = None) -> str:
+    """
+    Returns the words a symbol is spoken as: its entry in `WORDS`, the name of an `\\operatorname` or other command,
+    letters and numbers as they are, and the Unicode name of any other character.
+
+    :param token: Token of the symbol.
+    :param symbol: Code point of the symbol from `convert_symbol()`, if already looked up.
+    """
+    if token in WORDS:
+        return WORDS[token]
+    if token.startswith(commands.OPERATORNAME):
+        return token[token.find("{") + 1 : -1]
+    match = REFERENCE_PATTERN.fullmatch(token)
+    if match is not None and int(match.group(1), 16) <= sys.maxunicode:
+        token = unicodedata.normalize("NFKC", chr(int(match.group(1), 16)))  # styled letters are read as letters
+    elif token.startswith(commands.BACKSLASH):
+        return token[1:]
+    if token.isalnum() or token[:1].isdigit():
+        return token
+    if len(token) != 1:
+        return token if symbol is None else symbol_words(chr(int(symbol, 16)))
+    return unicodedata.name(token, token).lower()
+
+
+def fill(template: tuple[Union[str, int], ...], arguments: list[str]) -> str:
+    """
+    Returns the words of a structural command from the words of its arguments.
+
+    :param template: Entry of `TEMPLATES`.
+    :param arguments: Words of each argument.
+    """
+    return " ".join(arguments[part] if isinstance(part, int) else part for part in template)
@@ -0,0 +1,23 @@
+import sqlite3
+from typing import Optional
+
+from latex2mathml.converter import cached_convert
+
+FUNCTION_NAME = "latex2mathml"
+
+
+def _convert(latex: Optional[str], display: Optional[str] = None) -> Optional[str]:
+    if latex is None:
+        return None
+    return cached_convert(latex, display=display or "inline")
+
+
+def register_function(connection: sqlite3.Connection, name: str = FUNCTION_NAME) -> None:
+    """
+    Registers `latex2mathml(latex[, display])` as a deterministic SQL function on a SQLite connection.
+
+    :param connection: SQLite connection.
+    :param name: SQL function name (default="latex2mathml").
+    """
+    connection.create_function(name, 1, _convert, deterministic=True)
+    connection.create_function(name, 2, _convert, deterministic=True)
@@ -1,13 +1,24 @@
 import os
 import re
+import sys
 
 SYMBOLS_FILE: str = os.path.join(os.path.dirname(os.path.realpath(__file__)), "unimathsymbols.txt")
+REFERENCE_PATTERN = re.compile(r"&#x([0-9a-fA-F]+);")
 
 
 def convert_symbol(symbol: str) -> str | None:
     return SYMBOLS.get(symbol, None)
 
 
+def decode_references(text: str) -> str:
+    return REFERENCE_PATTERN.sub(_decode_reference, text) if "&#x" in text else text
+
+
+def _decode_reference(match: re.Match) -> str:
+    code_point = int(match.group(1), 16)
+    return match.group() if code_point > sys.maxunicode else chr(code_point)  # `\unicode{x110000}` stays a reference
+
+
 def parse_symbols() -> dict[str, str]:
     _symbols: dict[str, str] = {}
     with open(SYMBOLS_FILE, encoding="utf-8") as f:
@@ -0,0 +1,132 @@
+import re
+from collections.abc import Iterator, Sequence
+from typing import Optional
+
+from latex2mathml import commands
+from latex2mathml.converter import NUMERIC, Converter
+from latex2mathml.symbols_parser import decode_references
+from latex2mathml.tokenizer import tokenize
+from latex2mathml.walker import Node, walk
+
+PARAMETER_PATTERN = re.compile(r"{#([1-9])}|#([1-9])")
+SENTINEL = 0xE000  # private use characters stand in for the values while the template is converted
+SENTINEL_PATTERN = re.compile("[\ue001-\ue009]|&#x0E00[1-9];")  # `ASCII` output writes them as references
+SLOT_PATTERN = re.compile("<mrow><mi>([\ue001-\ue009]|&#x0E00[1-9];)</mi></mrow>")
+
+
+class Template:
+    """
+    A Latex string with parameters `#1` to `#9`, converted to MathML once. `render()` only converts the values and
+    splices them in, giving the same MathML as converting the Latex string with each parameter replaced by its value
+    in braces, e.g. `\\frac{#1}{#2}` filled with `1` and `2` converts like `\\frac{1}{2}`, and `#1^2` filled with `a+b`
+    like `{a+b}^2`. A parameter whose conversion depends on where it is, such as inside `\\mathbf{}` or `\\text{}`, is
+    rejected. Values can use the macros the template defines, but as `#1` to `#9` are the template parameters, those
+    macros cannot take arguments.
+
+    :param latex: Latex string with parameters.
+    :param xmlns: MathML namespace.
+    :param display: Display mode (default="inline").
+    :param output_encoding: `NUMERIC`, `UNICODE` or `ASCII`, see `convert_bytes()`.
+    """
+
+    def __init__(
+        self,
+        latex: str,
+        xmlns: str = "http://www.w3.org/1998/Math/MathML",
+        display: str = "inline",
+        output_encoding: str = NUMERIC,
+    ) -> None:
+        self.latex = latex
+        self.display = display
+        self._converter = Converter(
+            xmlns=xmlns, display=display, equation_placeholders=True, output_encoding=output_encoding
+        )
+
+        numbers = [int(match.group(1) or match.group(2)) for match in PARAMETER_PATTERN.finditer(latex)]
+        self.parameters = max(numbers, default=0)
+        if set(numbers) != set(range(1, self.parameters + 1)):
+            raise ValueError(f"Template parameters must be numbered from #1: {latex}")
+
+        filled = PARAMETER_PATTERN.sub(
+            lambda match: f"{{{chr(SENTINEL + int(match.group(1) or match.group(2)))}}}", latex
+        )
+        # a slot must stay a group of its own whatever the value, e.g. `\operatorname{#1}` is a group for `x` but
+        # `\operatorname{sn}` is a single token
+        slots = list(_slots(walk(filled, display, spans=True)))
+        if len(slots) != len(numbers) or any(
+            list(tokenize(f"{filled[:start]}{{x}}"))[-3:] != ["{", "x", "}"] for start in slots
+        ):
+            raise ValueError(f"Template parameters must not be in a font, text or other context: {latex}")
+        # equation numbers are placed at render time, as equations of the values come before or after them
+        self._parts: list[str] = []
+        self._fills: list[Optional[int]] = []  # between two parts, a slot or else an equation number
+        for number, mathml in enumerate(
+            self._converter.split_equation_numbers(self._converter.convert_to_tree(filled))
+        ):
+            pieces = SLOT_PATTERN.split(mathml)
+            if number:
+                self._fills.append(None)
+            self._parts.append(pieces[0])
+            for piece, part in zip(pieces[1::2], pieces[2::2]):
+                self._fills.append(ord(decode_references(piece)) - SENTINEL - 1)
+                self._parts.append(part)
+        slot_count = sum(fill is not None for fill in self._fills)
+        if slot_count != len(numbers) or any(SENTINEL_PATTERN.search(part) for part in self._parts):
+            raise ValueError(f"Template parameters must not be in a font, text or other context: {latex}")
+
+    def render(self, *values: str) -> str:
+        """
+        Returns the MathML of the template filled with values, with the equations numbered as in `convert()` of the
+        filled Latex.
+
+        :param values: Latex strings, one per parameter.
+        """
+        if len(values) != self.parameters:
+            raise ValueError(f"Expected {self.parameters} values, got {len(values)}")
+        self._converter.equation_counter = 0
+        converted = [self._convert_value(value) for value in values]
+        counter = 0
+        parts = [self._parts[0]]
+        for fill, part in zip(self._fills, self._parts[1:]):
+            if fill is None:
+                counter += 1
+                parts.append(f"({counter})")
+            else:
+                pieces = converted[fill]
+                parts.append(pieces[0])
+                for piece in pieces[1:]:
+                    counter += 1
+                    parts.append(f"({counter})")
+                    parts.append(piece)
+            parts.append(part)
+        return "".join(parts)
+
+    def _convert_value(self, value: str) -> list[str]:
+        """
+        Returns the MathML of a value split around its equation numbers.
+        """
+        row = self._converter.convert_to_tree(f"{{{value}}}")[0]
+        pieces = [""]
+        for child in row:
+            first, *rest = self._converter.split_equation_numbers(child)
+            pieces[-1] += first
+            pieces.extend(rest)
+        return pieces
+
+
+def _slots(nodes: Sequence[Node]) -> Iterator[int]:
+    """
+    Yields the source offsets of the `{}` groups holding nothing but a sentinel.
+    """
+    for node in nodes:
+        children = node.children or ()
+        if (
+            node.token == commands.BRACES
+            and len(children) == 1
+            and children[0].children is None
+            and SENTINEL_PATTERN.fullmatch(children[0].token)
+            and node.span is not None
+        ):
+            yield node.span[0]
+        else:
+            yield from _slots(children)
@@ -1,9 +1,16 @@
+import codecs
+import mmap
 import re
-from typing import Iterator
+import string
+from functools import lru_cache
+from itertools import accumulate
+from typing import IO, Iterable, Iterator, Literal, Optional, Union, overload
 
 from latex2mathml import commands
 from latex2mathml.symbols_parser import convert_symbol
 
+CHUNK_SIZE = 1 << 16
+SEPARATOR = "\0\n}"  # only a comment, `\text{` or `\verb` can match into it, and none past it
 UNITS = ("in", "mm", "cm", "pt", "em", "ex", "pc", "bp", "dd", "cc", "sp", "mu")
 
 PATTERN = re.compile(
@@ -29,33 +36,347 @@ PATTERN = re.compile(
     re.VERBOSE,
 )
 
+COMMENT = "comment"
+LETTER = "letter"
+NUMBER = "number"
+DIMENSION = "dimension"
+CHAR = "char"
+COMMAND = "command"
+FONT = "font"
+BEGIN = "begin"
+END = "end"
+OPERATORNAME = "operatorname"
+TEXT = "text"
+SYMBOL = "symbol"
 
-def tokenize(latex_string: str, skip_comments: bool = True) -> Iterator[str]:
+
+_PLAIN_GROUPS = frozenset(("letter", "number", "escaped", "dot_decimal"))
+_PLAIN_KINDS = {"letter": LETTER, "number": NUMBER, "escaped": COMMAND, "char": CHAR}
+_GROUP_PIECES = {
+    "subsup_digit": ("subsup_operator", "subsup_digit"),
+    "text_content": ("text_cmd", "text_content"),
+    "frac_arg1": ("frac_cmd", "frac_arg1"),
+    "frac_arg2": ("frac_cmd", "frac_arg1", "frac_arg2"),
+    "math_close": ("math_font", "math_open", "math_arg", "math_close"),
+}
+_COMPLETE_GROUPS = frozenset(
+    (
+        "subsup_digit",
+        "dimension",
+        "escaped",
+        "begin_end",
+        "operatorname",
+        "text_content",
+        "frac_arg2",
+        "math_close",
+        "verb",
+    )
+)
+# the separator goes first, so that it is matched without trying every other group
+_MANY_PATTERN = re.compile(rf"(?P<separator>{re.escape(SEPARATOR)})|{PATTERN.pattern}", re.VERBOSE)
+_CROSSING_GROUPS = frozenset(("comment", "text_content", "verb"))  # the only groups matching `SEPARATOR` characters
+_NUMBER_CHARACTERS = "0123456789.-" + string.whitespace
+_NUMBER_REACH = re.compile(r"\d*(?:\.\d*)?\s*")
+_WHITESPACE = re.compile(r"\s*")
+_COMMAND_REACH = re.compile(r"\*?\s*(?:{[^}]*}?|[.\d])?")
+_GROUP_KINDS = {
+    "comment": COMMENT,
+    "letter": LETTER,
+    "subsup_operator": CHAR,
+    "subsup_digit": NUMBER,
+    "dimension": DIMENSION,
+    "number": NUMBER,
+    "escaped": COMMAND,
+    "operatorname": OPERATORNAME,
+    "text_cmd": COMMAND,
+    "text_content": TEXT,
+    "frac_cmd": COMMAND,
+    "math_font": FONT,
+    "math_open": CHAR,
+    "math_arg": LETTER,
+    "math_close": CHAR,
+    "verb": COMMAND,
+    "verb_content": TEXT,
+    "char": CHAR,
+    "symbol": SYMBOL,
+}
+
+
+class Token(str):
+    """
+    A token tagged with its kind (`LETTER`, `NUMBER`, `COMMAND`, `BEGIN`, `TEXT`, ...) and the `[start, end)` offsets
+    of its source text.
+    """
+
+    kind: str
+    start: int
+    end: int
+
+    def __new__(cls, value: str, kind: str, start: int, end: int) -> "Token":
+        token = super().__new__(cls, value)
+        token.kind = kind
+        token.start = start
+        token.end = end
+        return token
+
+    def __reduce__(self) -> tuple[type["Token"], tuple[str, str, int, int]]:  # for pickle and deepcopy
+        return Token, (str(self), self.kind, self.start, self.end)
+
+
+@overload
+def tokenize(
+    latex_string: str, skip_comments: bool = ..., spans: Literal[False] = ..., typed: Literal[False] = ...
+) -> Iterator[str]: ...
+
+
+@overload
+def tokenize(
+    latex_string: str, skip_comments: bool = ..., *, spans: Literal[True], typed: bool = ...
+) -> Iterator[Token]: ...
+
+
+@overload
+def tokenize(
+    latex_string: str, skip_comments: bool = ..., spans: bool = ..., *, typed: Literal[True]
+) -> Iterator[Token]: ...
+
+
+@overload
+def tokenize(latex_string: str, skip_comments: bool, spans: Literal[True], typed: bool = ...) -> Iterator[Token]: ...
+
+
+@overload
+def tokenize(latex_string: str, skip_comments: bool = ..., spans: bool = ..., typed: bool = ...) -> Iterator[str]: ...
+
+
+def tokenize(latex_string: str, skip_comments: bool = True, spans: bool = False, typed: bool = False) -> Iterator[str]:
     """
     Converts Latex string into tokens.
 
     :param latex_string: Latex string.
     :param skip_comments: Flag to skip comments (default=True).
+    :param spans: Yield `Token`s, which carry source offsets (default=False).
+    :param typed: Yield `Token`s, which carry their kind (default=False).
+    """
+    if spans or typed:
+        yield from _tokenize_typed(latex_string, skip_comments)
+        return
+    for match in PATTERN.finditer(latex_string):
+        group = match.lastgroup
+        captured = match.group()
+        if group in _PLAIN_GROUPS or (group == "command" and not captured.startswith(commands.MATH)):
+            yield captured
+        elif group == "char":
+            if captured != "%" or not skip_comments:
+                yield captured
+        else:
+            for _, captured in _pieces(match, group, skip_comments):
+                yield captured
+
+
+def kind_of(token: str) -> str:
     """
+    Returns the kind of a token: `Token.kind` for the tokens of `tokenize(..., typed=True)`, or else the kind the
+    string is tokenized as, cached per string, and `CHAR` if it is not a single token.
+    """
+    return token.kind if isinstance(token, Token) else _classify(token)
+
+
+@lru_cache(maxsize=4096)
+def _classify(token: str) -> str:
+    tokens = list(_tokenize_typed(token, skip_comments=False))
+    return tokens[0].kind if len(tokens) == 1 and tokens[0] == token else CHAR
+
+
+def _tokenize_typed(latex_string: str, skip_comments: bool) -> Iterator[Token]:
     for match in PATTERN.finditer(latex_string):
-        tokens = tuple(filter(lambda x: x is not None, match.groups()))
-        if tokens[0].startswith(commands.VERB):
-            yield commands.VERB
-            yield tokens[2]  # verb_content
+        group = match.lastgroup
+        kind = _PLAIN_KINDS.get(group or "")
+        if kind is not None:
+            captured = match.group()
+            if kind != CHAR or captured != "%" or not skip_comments:
+                yield Token(captured, kind, match.start(), match.end())
+            continue
+        if group == "command" and not match.group().startswith(commands.MATH):
+            yield Token(match.group(), COMMAND, match.start(), match.end())
+            continue
+        for group, captured in _pieces(match, group, skip_comments):
+            if group == "symbol":
+                start, end = match.span()
+            elif group == "verb":
+                start = match.start()
+                end = start + len(commands.VERB)
+            else:
+                start, end = match.span(group)
+            if group in ("command", "math_font"):
+                kind = (
+                    FONT
+                    if captured.startswith(commands.MATH) and captured not in commands.MATH_NON_FONT_COMMANDS
+                    else COMMAND
+                )
+            elif group == "begin_end":
+                kind = BEGIN if captured.startswith(commands.BEGIN) else END
+            elif group in ("dot_decimal", "frac_arg1", "frac_arg2"):
+                kind = NUMBER if captured[-1].isdigit() else CHAR
+            else:
+                kind = _GROUP_KINDS[group]
+            yield Token(captured, kind, start, end)
+
+
+def _pieces(match: re.Match, group: Optional[str], skip_comments: bool) -> Iterator[tuple[str, str]]:
+    """
+    Yields the `(group, token)` pairs of a match, where `group` names the regex group the token was captured by.
+    """
+    groups = _GROUP_PIECES.get(group or "", (group or "",))
+    first = match.group(groups[0])
+    if group == "verb":
+        yield "verb", commands.VERB
+        yield "verb_content", match.group("verb_content")
+        return
+    if first.startswith(commands.MATH) and first not in commands.MATH_NON_FONT_COMMANDS:
+        symbol = convert_symbol("".join(match.group(name) for name in groups))
+        if symbol:
+            yield "symbol", f"&#x{symbol};"
+            return
+    for name in groups:
+        captured = match.group(name)
+        if skip_comments and captured.startswith("%"):
+            break
+        if captured.endswith(UNITS) and captured[0:1].isdigit():
+            yield name, captured.replace(" ", "")
             continue
-        if tokens[0].startswith(commands.MATH) and tokens[0] not in commands.MATH_NON_FONT_COMMANDS:
-            full_math = "".join(tokens)
-            symbol = convert_symbol(full_math)
-            if symbol:
-                yield f"&#x{symbol};"
-                continue
-        for captured in tokens:
-            if skip_comments and captured.startswith("%"):
+        if captured.startswith((commands.BEGIN, commands.END, commands.OPERATORNAME)):
+            yield name, "".join(captured.split(" "))
+            continue
+        yield name, captured
+
+
+def tokenize_many(latex_strings: Iterable[str], skip_comments: bool = True) -> list[list[str]]:
+    """
+    Converts many Latex strings into tokens with a single regex pass over the distinct strings joined by `SEPARATOR`,
+    giving the same tokens as calling `tokenize()` on each string. A string that repeats is tokenized once and its
+    repeats get copies.
+
+    :param latex_strings: Latex strings.
+    :param skip_comments: Flag to skip comments (default=True).
+    """
+    latex_strings = list(latex_strings)
+    joined = list(dict.fromkeys(latex_strings))
+    buffer = "".join([latex_string + SEPARATOR for latex_string in joined])
+    if buffer.count("\0") > len(joined):  # strings holding the separator are tokenized on their own
+        joined = [latex_string for latex_string in joined if "\0" not in latex_string]
+        buffer = "".join([latex_string + SEPARATOR for latex_string in joined])
+    ends = list(accumulate(len(latex_string) + len(SEPARATOR) for latex_string in joined))  # offsets past separators
+    scanned: list[list[str]] = []
+    tokens: list[str] = []
+    append = tokens.append
+    matches = _MANY_PATTERN.finditer(buffer)
+    while True:
+        for match in matches:
+            group = match.lastgroup
+            if group in _PLAIN_GROUPS:
+                append(match.group())
+            elif group == "separator":
+                scanned.append(tokens)
+                tokens = []
+                append = tokens.append
+            elif group == "char":
+                captured = match.group()
+                if captured != "%" or not skip_comments:
+                    append(captured)
+            elif group == "command" and not match.group().startswith(commands.MATH):
+                append(match.group())
+            elif group in _CROSSING_GROUPS and match.end() > ends[len(scanned)] - len(SEPARATOR):
+                index = len(scanned)  # e.g. an unterminated `\text{` runs into the separator
+                tokens[:] = tokenize(joined[index], skip_comments)
+                scanned.append(tokens)
+                tokens = []
+                append = tokens.append
+                matches = _MANY_PATTERN.finditer(buffer, ends[index])
                 break
-            if captured.endswith(UNITS) and captured[0:1].isdigit():
-                yield captured.replace(" ", "")
-                continue
-            if captured.startswith((commands.BEGIN, commands.END, commands.OPERATORNAME)):
-                yield "".join(captured.split(" "))
-                continue
-            yield captured
+            else:
+                for _, captured in _pieces(match, group, skip_comments):
+                    append(captured)
+        else:
+            break
+    if len(joined) == len(latex_strings):
+        return scanned
+    results = dict(zip(joined, scanned))
+    seen: set[str] = set()
+    output: list[list[str]] = []
+    for latex_string in latex_strings:
+        if latex_string not in results:  # holds the separator
+            results[latex_string] = list(tokenize(latex_string, skip_comments))
+        tokens = results[latex_string]
+        output.append(list(tokens) if latex_string in seen else tokens)  # repeats get a copy
+        seen.add(latex_string)
+    return output
+
+
+def tokenize_stream(
+    fp: Union[IO[str], IO[bytes], mmap.mmap], chunk_size: int = CHUNK_SIZE, skip_comments: bool = True
+) -> Iterator[str]:
+    """
+    Converts Latex from a file object or `mmap` into tokens, reading `chunk_size` characters or bytes at a time.
+    Bytes are decoded as UTF-8. A token that may continue past the end of the data read so far, for example a number
+    or an unterminated `\\text{`, is held back until the next chunk, so the tokens are the same as `tokenize()` on the
+    whole input.
+
+    :param fp: Text or binary file object, or `mmap`.
+    :param chunk_size: Characters or bytes read at a time.
+    :param skip_comments: Flag to skip comments (default=True).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    eof = False
+    while not eof:
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buffer += decoder.decode(chunk, final=eof) if isinstance(chunk, bytes) else chunk
+        size = len(buffer)
+        position = size
+        # matches ending before the last character that cannot continue a number are decided, except commands
+        guard = len(buffer[: size - 2].rstrip(_NUMBER_CHARACTERS)) - 1
+        for match in PATTERN.finditer(buffer):
+            group = match.lastgroup
+            if not eof and (match.end() > guard or group == "command") and _reach(buffer, match) > size:
+                position = match.start()
+                break
+            captured = match.group()
+            if group in _PLAIN_GROUPS or (group == "command" and not captured.startswith(commands.MATH)):
+                yield captured
+            elif group == "char":
+                if captured != "%" or not skip_comments:
+                    yield captured
+            else:
+                for _, captured in _pieces(match, group, skip_comments):
+                    yield captured
+        buffer = buffer[position:]
+
+
+def _reach(buffer: str, match: re.Match) -> int:
+    """
+    Returns an upper bound of the end of the text `PATTERN` may have to read to decide on `match`.
+    """
+    group = match.lastgroup
+    end = match.end()
+    if group in _COMPLETE_GROUPS:
+        return end
+    if group == "number" or (group == "char" and match.group() == "-"):
+        return _match_end(_NUMBER_REACH, buffer, end) + 2  # "-12 " may still become the dimension "-12 pt"
+    if group == "frac_arg1":
+        return _match_end(_WHITESPACE, buffer, end) + 1  # `\frac1 2` may still take a second digit
+    if group == "command":
+        if match.group().startswith(commands.VERB):  # `\verb` without its closing delimiter on this line
+            newline = buffer.find("\n", end)
+            return len(buffer) + 1 if newline < 0 else newline + 1
+        reach = _COMMAND_REACH.match(buffer, end)
+        if reach is not None and reach.group().endswith("}"):
+            return reach.end()
+        return _match_end(_COMMAND_REACH, buffer, end) + 1  # `\text {` may still find its closing brace
+    return end + 1  # a letter or number may continue, or a character may start a longer token
+
+
+def _match_end(pattern: re.Pattern, buffer: str, position: int) -> int:
+    match = pattern.match(buffer, position)
+    return position if match is None else match.end()
@@ -0,0 +1,115 @@
+from typing import Callable, ClassVar, Iterable, Iterator, Optional, Union, overload
+from xml.etree import ElementTree
+
+
+class Element:
+    """
+    A compact MathML element with the part of the `xml.etree.ElementTree.Element` API the converter uses. Attributes
+    are only allocated once there are some, a single child is kept without a list, and there is no tail.
+    `to_element()` exports the tree to `xml.etree.ElementTree`.
+    """
+
+    __slots__ = ("tag", "text", "_attrib", "_children")
+
+    tail: ClassVar[Optional[str]] = None
+
+    def __init__(self, tag: str, attrib: Optional[dict[str, str]] = None, **extra: str) -> None:
+        self.tag = tag
+        self.text: Optional[str] = None
+        self._attrib = {**(attrib or {}), **extra} if attrib or extra else None
+        self._children: Union[None, Element, list[Element]] = None
+
+    @property
+    def attrib(self) -> dict[str, str]:
+        if self._attrib is None:
+            self._attrib = {}
+        return self._attrib
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return default if self._attrib is None else self._attrib.get(key, default)
+
+    def items(self) -> list[tuple[str, str]]:
+        return [] if self._attrib is None else list(self._attrib.items())
+
+    def set(self, key: str, value: str) -> None:
+        self.attrib[key] = value
+
+    def append(self, element: "Element") -> None:
+        children = self._children
+        if children is None:
+            self._children = element
+        elif isinstance(children, Element):
+            self._children = [children, element]
+        else:
+            children.append(element)
+
+    def extend(self, elements: Iterable["Element"]) -> None:
+        for element in elements:
+            self.append(element)
+
+    def remove(self, element: "Element") -> None:
+        children = self._list()
+        children.remove(element)
+        self._set_list(children)
+
+    def __len__(self) -> int:
+        children = self._children
+        if children is None:
+            return 0
+        return 1 if isinstance(children, Element) else len(children)
+
+    def __iter__(self) -> Iterator["Element"]:
+        return iter(self._list())
+
+    @overload
+    def __getitem__(self, index: int) -> "Element": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list["Element"]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["Element", list["Element"]]:
+        return self._list()[index]
+
+    def __setitem__(self, index: slice, elements: list["Element"]) -> None:
+        children = list(self._list())
+        children[index] = elements
+        self._set_list(children)
+
+    def to_element(
+        self,
+        parent: Optional[ElementTree.Element] = None,
+        namespace: Optional[str] = None,
+        decode: Optional[Callable[[str], str]] = None,
+    ) -> ElementTree.Element:
+        """
+        Returns the tree as `xml.etree.ElementTree` elements.
+
+        :param parent: Element to append the tree to.
+        :param namespace: Namespace to qualify the tags with, as in `{namespace}tag`.
+        :param decode: Function applied to the text, e.g. to replace character references by characters.
+        """
+        tag = self.tag if namespace is None else f"{{{namespace}}}{self.tag}"
+        attrib = self._attrib or {}
+        if parent is None:
+            element = ElementTree.Element(tag, attrib)
+        else:
+            element = ElementTree.SubElement(parent, tag, attrib)
+        element.text = self.text if decode is None or self.text is None else decode(self.text)
+        for child in self._list():
+            child.to_element(element, namespace, decode)
+        return element
+
+    def _list(self) -> list["Element"]:
+        children = self._children
+        if children is None:
+            return []
+        return [children] if isinstance(children, Element) else children
+
+    def _set_list(self, children: list["Element"]) -> None:
+        self._children = None if not children else children[0] if len(children) == 1 else children
+
+
+def SubElement(parent: Element, tag: str, attrib: Optional[dict[str, str]] = None, **extra: str) -> Element:
+    element = Element(tag, attrib, **extra)
+    parent.append(element)
+    return element
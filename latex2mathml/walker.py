@@ -17,7 +17,7 @@ from latex2mathml.exceptions import (
     NumeratorNotFoundError,
 )
 from latex2mathml.symbols_parser import convert_symbol
-from latex2mathml.tokenizer import tokenize
+from latex2mathml.tokenizer import BEGIN, COMMAND, FONT, Token, kind_of, tokenize
 
 MULTIPRIMES = "multiprimes"
 MAX_MACRO_DEPTH = 100
@@ -31,10 +31,45 @@ class Node(NamedTuple):
     text: Optional[str] = None
     attributes: Optional[dict[str, str]] = None
     modifier: Optional[str] = None
+    span: Optional[tuple[int, int]] = None  # source offsets, only set by `walk(..., spans=True)`
 
 
-def walk(data: str, display: str = "inline", macros: Optional[dict[str, tuple[list[str], int]]] = None) -> list[Node]:
-    tokens = tokenize(data)
+class _SpanTracker:
+    """
+    Iterator over `Token`s that remembers the start offset of the last token taken and the end offset of the last two,
+    so `_walk` can record the span a node covers after its arguments have been consumed.
+    """
+
+    __slots__ = ("tokens", "start", "end", "previous_end")
+
+    def __init__(self, tokens: Iterator[Token]) -> None:
+        self.tokens = tokens
+        self.start = self.end = self.previous_end = 0
+
+    def __iter__(self) -> "_SpanTracker":
+        return self
+
+    def __next__(self) -> Token:
+        token = next(self.tokens)
+        self.start, self.previous_end, self.end = token.start, self.end, token.end
+        return token
+
+
+def walk(
+    data: str,
+    display: str = "inline",
+    macros: Optional[dict[str, tuple[list[str], int]]] = None,
+    spans: bool = False,
+) -> list[Node]:
+    """
+    Walks Latex string into a tree of nodes.
+
+    :param data: Latex string.
+    :param display: Display mode (default="inline").
+    :param macros: Macro definitions, updated by `\\newcommand` and friends.
+    :param spans: Record the source offsets each node covers in `Node.span` (default=False).
+    """
+    tokens: Iterator[str] = _SpanTracker(tokenize(data, spans=True)) if spans else tokenize(data)
     block = display == "block"
     return _walk(tokens, block=block, macros={} if macros is None else macros)
 
@@ -51,7 +86,14 @@ def _walk(
     group: list[Node] = []
     token: str
     has_available_tokens = False
+    tracker = tokens if isinstance(tokens, _SpanTracker) else None
+    start = size = 0
+    previous_group = group
     for token in tokens:
+        if tracker is not None:
+            if has_available_tokens:
+                _record_spans(group, previous_group, size, start, tracker.previous_end)
+            start, size, previous_group = tracker.start, len(group), group
         has_available_tokens = True
         if token == terminator:
             delimiter = None
@@ -178,15 +220,13 @@ def _walk(
             if token in (commands.OVERSET, commands.STACKREL, commands.UNDERSET):
                 children = children[::-1]
             node = Node(token=token, children=children)
-        elif token in commands.COMMANDS_WITH_ONE_PARAMETER or (
-            token.startswith(commands.MATH) and token not in commands.MATH_NON_FONT_COMMANDS
-        ):
+        elif token in commands.COMMANDS_WITH_ONE_PARAMETER or kind_of(token) == FONT:
             children = tuple(_walk(tokens, terminator=terminator, limit=1, macros=_macros))
             node = Node(token=token, children=children)
         elif token == commands.NOT:
             try:
                 next_node = tuple(_walk(tokens, terminator=terminator, limit=1, macros=_macros))[0]
-                if next_node.token.startswith("\\"):
+                if kind_of(next_node.token) == COMMAND:
                     negated_symbol = r"\n" + next_node.token[1:]
                     symbol = convert_symbol(negated_symbol)
                     if symbol:
@@ -285,7 +325,7 @@ def _walk(
             attr_name = "class" if token == commands.CLASS else "style"
             attributes = {attr_name: next(tokens)}
             next_node = tuple(_walk(tokens, terminator=terminator, limit=1, macros=_macros))[0]
-            node = next_node._replace(attributes=attributes)
+            node = next_node._replace(attributes=attributes, span=None)
         elif token in (
             *commands.BIG.keys(),
             *commands.BIG_OPEN_CLOSE.keys(),
@@ -458,7 +498,7 @@ def _walk(
             if not width.isdigit():
                 raise InvalidWidthError
             node = Node(token=token, children=(child,), attributes={"width": f"{0.0555 * int(width):.3f}em"})
-        elif token.startswith(commands.BEGIN):
+        elif kind_of(token) == BEGIN:
             node = _get_environment_node(token, tokens, macros=_macros, block=block)
         elif token == commands.NEWCOMMAND:
             _parse_newcommand(tokens, _macros)
@@ -478,7 +518,10 @@ def _walk(
             expanded_tokens = _expand_macro(token, tokens, _macros)
             if not expanded_tokens:
                 continue
-            chained = chain(iter(expanded_tokens), tokens)
+            chained: Iterator[str] = chain(iter(expanded_tokens), tokens)
+            if tracker is not None:  # expanded tokens cover the macro call
+                expanded = [Token(t, kind_of(t), start, tracker.end) for t in expanded_tokens]
+                chained = _SpanTracker(chain(expanded, tracker))
             remaining_limit = max(0, limit - len(group)) if limit else 0
             group.extend(
                 _walk(
@@ -495,9 +538,29 @@ def _walk(
             break
     if not has_available_tokens:
         raise NoAvailableTokensError
+    if tracker is not None:
+        _record_spans(group, previous_group, size, start, tracker.end)
     return group
 
 
+def _record_spans(group: list[Node], previous_group: list[Node], size: int, start: int, end: int) -> None:
+    """
+    Sets the span of the nodes added to `group` while handling the token at `start`, which may have popped up to two
+    nodes (an operand and `\\limits`) or replaced `group` entirely (`\\over` and friends).
+    """
+    first = max(0, size - 2) if group is previous_group else 0
+    for i in range(first, len(group)):
+        node = group[i]
+        if node.span is None:
+            group[i] = node._replace(span=(min(start, _span_start(node, start)), end))
+
+
+def _span_start(node: Node, default: int) -> int:
+    if node.span is not None:
+        return node.span[0]
+    return min((_span_start(child, default) for child in node.children or ()), default=default)
+
+
 def _make_subsup(node: Node) -> tuple[str, tuple[Node, ...]]:
     if node.token != commands.BRACES:
         raise MissingSuperScriptOrSubscriptError
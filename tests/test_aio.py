@@ -0,0 +1,71 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator
+
+import pytest
+
+from latex2mathml.aio import aconvert, aconvert_many
+from latex2mathml.converter import convert
+from latex2mathml.exceptions import MissingSuperScriptOrSubscriptError
+
+FORMULAS = [rf"\frac{{{i}}}{{x^{i}}}" for i in range(20)]
+
+
+async def _collect(**kwargs: object) -> list[tuple[int, str]]:
+    return [result async for result in aconvert_many(FORMULAS, **kwargs)]  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("inline_threshold", [pytest.param(0, id="executor"), pytest.param(100, id="inline")])
+def test_aconvert(inline_threshold: int) -> None:
+    result = asyncio.run(aconvert(r"\sqrt{2}", display="block", inline_threshold=inline_threshold))
+    assert result == convert(r"\sqrt{2}", display="block")
+
+
+def test_aconvert_process_executor() -> None:
+    async def run() -> str:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return await aconvert("x^2", executor=executor)
+
+    assert asyncio.run(run()) == convert("x^2")
+
+
+@pytest.mark.parametrize("limit", [1, 3, 50])
+def test_aconvert_many_ordered(limit: int) -> None:
+    assert asyncio.run(_collect(limit=limit)) == [(i, convert(latex)) for i, latex in enumerate(FORMULAS)]
+
+
+def test_aconvert_many_unordered() -> None:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = asyncio.run(_collect(ordered=False, executor=executor, limit=4))
+    assert sorted(result) == [(i, convert(latex)) for i, latex in enumerate(FORMULAS)]
+
+
+def test_aconvert_many_backpressure() -> None:
+    consumed: list[int] = []
+
+    def formulas() -> Iterator[str]:
+        for i, latex in enumerate(FORMULAS):
+            consumed.append(i)
+            yield latex
+
+    async def run() -> None:
+        iterator = aconvert_many(formulas(), limit=2)
+        assert await iterator.__anext__() == (0, convert(FORMULAS[0]))
+        assert len(consumed) == 2
+        await iterator.aclose()
+
+    asyncio.run(run())
+
+
+def test_aconvert_many_error() -> None:
+    async def run() -> None:
+        async for _ in aconvert_many(["x", "x^"]):
+            pass
+
+    with pytest.raises(MissingSuperScriptOrSubscriptError):
+        asyncio.run(run())
+
+
+def test_aconvert_many_invalid_limit() -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(limit=0))
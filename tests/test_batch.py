@@ -0,0 +1,219 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pytest
+
+from latex2mathml.batch import (
+    MANIFEST_FILE,
+    Pipeline,
+    build_directory,
+    convert_batch,
+    convert_chunk,
+    convert_document,
+    convert_records,
+    make_executor,
+    parse_shard,
+    read_checkpoint,
+)
+from latex2mathml.converter import convert
+from latex2mathml.exceptions import MissingSuperScriptOrSubscriptError
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        pytest.param("no math", "no math", id="no-math"),
+        pytest.param("a $x^2$ b", f"a {convert('x^2')} b", id="inline-dollar"),
+        pytest.param(r"a \(x\) b", f"a {convert('x')} b", id="inline-paren"),
+        pytest.param("$$x$$", convert("x", display="block"), id="block-dollar"),
+        pytest.param(r"\[ \frac{1}{2} \]", convert(r"\frac{1}{2}", display="block"), id="block-bracket"),
+        pytest.param(r"costs \$5 and $y$", rf"costs \$5 and {convert('y')}", id="escaped-dollar"),
+        pytest.param(r"$\$1$", convert(r"\$1"), id="escaped-dollar-inside-math"),
+    ],
+)
+def test_convert_document(text: str, expected: str) -> None:
+    assert convert_document(text) == expected
+
+
+@pytest.mark.parametrize("jobs", [pytest.param(1, id="in-process"), pytest.param(None, id="process-pool")])
+def test_build_directory(tmp_path: Path, jobs: Optional[int]) -> None:
+    source, destination = tmp_path / "src", tmp_path / "out"
+    (source / "nested").mkdir(parents=True)
+    (source / "a.md").write_text("$x$", encoding="utf-8")
+    (source / "nested" / "b.tex").write_text(r"\[y\]", encoding="utf-8")
+    (source / "c.txt").write_text("$z$", encoding="utf-8")
+
+    assert build_directory(source, destination, jobs=jobs) == [Path("a.md"), Path("nested/b.tex")]
+    assert (destination / "a.md").read_text(encoding="utf-8") == convert("x")
+    assert (destination / "nested" / "b.tex").read_text(encoding="utf-8") == convert("y", display="block")
+    assert not (destination / "c.txt").exists()
+
+    assert build_directory(source, destination, jobs=jobs) == []
+
+    (source / "a.md").write_text("$x + 1$", encoding="utf-8")
+    (source / "nested" / "b.tex").unlink()
+    assert build_directory(source, destination, jobs=jobs) == [Path("a.md")]
+    assert not (destination / "nested" / "b.tex").exists()
+    with open(destination / MANIFEST_FILE, encoding="utf-8") as f:
+        assert list(json.load(f)) == ["a.md"]
+
+
+def test_build_directory_rebuilds_missing_output(tmp_path: Path) -> None:
+    source, destination = tmp_path / "src", tmp_path / "out"
+    source.mkdir()
+    (source / "a.html").write_text("<p>$x$</p>", encoding="utf-8")
+    build_directory(source, destination, jobs=1)
+    (destination / "a.html").unlink()
+    assert build_directory(source, destination, jobs=1) == [Path("a.html")]
+
+
+@pytest.mark.parametrize(
+    "shard, expected",
+    [
+        pytest.param("0/1", (0, 1), id="single"),
+        pytest.param("3/4", (3, 4), id="last"),
+    ],
+)
+def test_parse_shard(shard: str, expected: tuple[int, int]) -> None:
+    assert parse_shard(shard) == expected
+
+
+@pytest.mark.parametrize("shard", ["4/4", "-1/4", "1", "a/b", "1/2/3"])
+def test_parse_shard_invalid(shard: str) -> None:
+    with pytest.raises(ValueError):
+        parse_shard(shard)
+
+
+def test_convert_records_shards_partition_records() -> None:
+    records = [(i, f"x_{{{i}}}") for i in range(50)]
+    shards = [list(convert_records(records, shard=(i, 3))) for i in range(3)]
+    assert sorted(r for shard in shards for r in shard) == [(i, convert(latex)) for i, latex in records]
+    assert shards == [list(convert_records(records, shard=(i, 3))) for i in range(3)]
+
+
+def test_convert_records_with_executor() -> None:
+    records = [(str(i), rf"\sqrt{{{i}}}") for i in range(100)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = list(convert_records(records, display="block", skip={"0"}, executor=executor, chunk_size=7))
+    assert result == [(i, convert(latex, display="block")) for i, latex in records[1:]]
+
+
+def _write_records(path: Path, records: list[tuple[int, str]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for record_id, latex in records:
+            f.write(json.dumps({"id": record_id, "latex": latex}) + "\n")
+
+
+def _read_output(path: Path) -> list[tuple[int, str]]:
+    with open(path, encoding="utf-8") as f:
+        return [(record["id"], record["mathml"]) for record in map(json.loads, f)]
+
+
+@pytest.mark.parametrize("jobs", [pytest.param(1, id="in-process"), pytest.param(2, id="process-pool")])
+def test_convert_batch(tmp_path: Path, jobs: int) -> None:
+    records = [(i, f"{i}^2") for i in range(10)]
+    _write_records(tmp_path / "in.jsonl", records)
+    count = convert_batch(tmp_path / "in.jsonl", tmp_path / "out.jsonl", checkpoint=tmp_path / "ckpt", jobs=jobs)
+    assert count == 10
+    assert _read_output(tmp_path / "out.jsonl") == [(i, convert(latex)) for i, latex in records]
+    assert read_checkpoint(tmp_path / "ckpt") == ({str(i) for i in range(10)}, (tmp_path / "out.jsonl").stat().st_size)
+
+
+def test_convert_batch_resume(tmp_path: Path) -> None:
+    records = [(i, rf"\frac{{{i}}}{{2}}") for i in range(10)]
+    source, destination, checkpoint = tmp_path / "in.jsonl", tmp_path / "out.jsonl", tmp_path / "ckpt"
+    _write_records(source, records[:7])
+    convert_batch(source, destination, checkpoint=checkpoint, jobs=1, checkpoint_interval=3)
+
+    # simulate a crash after record 6 was written but before its checkpoint entry was complete
+    entries = checkpoint.read_text(encoding="utf-8").splitlines(keepends=True)
+    checkpoint.write_text("".join(entries[:2]) + '{"ids": ["6"', encoding="utf-8")
+    _write_records(source, records)
+
+    assert convert_batch(source, destination, checkpoint=checkpoint, resume=True, jobs=1) == 4
+    assert _read_output(destination) == [(i, convert(latex)) for i, latex in records]
+
+
+def test_convert_batch_shard(tmp_path: Path) -> None:
+    records = [(i, str(i)) for i in range(20)]
+    _write_records(tmp_path / "in.jsonl", records)
+    outputs = []
+    for index in range(2):
+        convert_batch(tmp_path / "in.jsonl", tmp_path / f"out-{index}.jsonl", shard=(index, 2), jobs=1)
+        outputs.extend(_read_output(tmp_path / f"out-{index}.jsonl"))
+    assert sorted(outputs) == [(i, convert(latex)) for i, latex in records]
+
+
+def test_build_directory_shard(tmp_path: Path) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    for i in range(6):
+        (source / f"{i}.md").write_text(f"${i}$", encoding="utf-8")
+    built = [build_directory(source, tmp_path / "out", jobs=1, shard=(i, 2)) for i in range(2)]
+    assert sorted(built[0] + built[1]) == [Path(f"{i}.md") for i in range(6)]
+    assert (tmp_path / "out" / ".latex2mathml-manifest.0-of-2.json").exists()
+    assert build_directory(source, tmp_path / "out", jobs=1, shard=(0, 2)) == []
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_make_executor(backend: str) -> None:
+    with make_executor(backend, 1) as executor:
+        assert executor.submit(convert_chunk, ["x"], "block").result() == [convert("x", display="block")]
+
+
+def test_make_executor_interpreter() -> None:
+    try:
+        from concurrent.futures import InterpreterPoolExecutor  # type: ignore[attr-defined] # noqa: F401
+    except ImportError:
+        with pytest.raises(RuntimeError):
+            make_executor("interpreter")
+    else:
+        with make_executor("interpreter", 1) as executor:
+            assert executor.submit(convert_chunk, ["x"]).result() == [convert("x")]
+
+
+def test_make_executor_invalid() -> None:
+    with pytest.raises(ValueError):
+        make_executor("fiber")
+
+
+def test_convert_batch_thread_backend(tmp_path: Path) -> None:
+    records = [(i, f"x_{i}") for i in range(10)]
+    _write_records(tmp_path / "in.jsonl", records)
+    assert convert_batch(tmp_path / "in.jsonl", tmp_path / "out.jsonl", jobs=2, backend="thread") == 10
+    assert _read_output(tmp_path / "out.jsonl") == [(i, convert(latex)) for i, latex in records]
+
+
+@pytest.mark.parametrize("queue_size", [1, 128])
+def test_pipeline(queue_size: int) -> None:
+    formulas = [rf"\begin{{matrix}} {i} & x \\ y & z \end{{matrix}}" for i in range(50)]
+    pipeline = Pipeline(display="block", queue_size=queue_size)
+    assert list(pipeline.convert(formulas)) == [convert(latex, display="block") for latex in formulas]
+    assert [stats.name for stats in pipeline.stats] == ["walk", "convert", "serialize"]
+    assert all(stats.items == 50 and 0 < stats.utilization <= 1 for stats in pipeline.stats)
+    assert "walk: 50 items" in repr(pipeline.stats[0])
+
+
+def test_pipeline_error() -> None:
+    pipeline = Pipeline()
+    results = pipeline.convert(["x", "x^", "y"])
+    assert next(results) == convert("x")
+    with pytest.raises(MissingSuperScriptOrSubscriptError):
+        next(results)
+
+
+def test_pipeline_input_error() -> None:
+    def formulas() -> Iterator[str]:
+        yield "x"
+        raise KeyError("input")
+
+    with pytest.raises(KeyError):
+        list(Pipeline().convert(formulas()))
+
+
+def test_pipeline_close_early() -> None:
+    results = Pipeline(queue_size=1).convert(str(i) for i in range(1000))
+    assert next(results) == convert("0")
+    results.close()
@@ -1,7 +1,32 @@
+import html
+import io
+from pathlib import Path
+from xml.etree.ElementTree import Element, fromstring, tostring
+from xml.sax.saxutils import unescape
+
 import pytest
 
-from latex2mathml.converter import Converter, convert, convert_to_element
+from latex2mathml.converter import (
+    ASCII,
+    NAMESPACE_ATTRIBUTE,
+    NAMESPACE_NONE,
+    NAMESPACE_QUALIFIED,
+    NUMERIC,
+    OUTPUT_ENCODINGS,
+    UNICODE,
+    Converter,
+    convert,
+    convert_bytes,
+    convert_many_to_element,
+    convert_to_element,
+    convert_to_stream,
+    convert_with_equation_index,
+    count_equations,
+    equation_counters,
+    renumber_equations,
+)
 from latex2mathml.exceptions import DoubleSubscriptsError, DoubleSuperscriptsError, MissingEndError
+from latex2mathml.symbols_parser import REFERENCE_PATTERN
 
 
 @pytest.mark.parametrize(
@@ -376,6 +401,9 @@ from latex2mathml.exceptions import DoubleSubscriptsError, DoubleSuperscriptsErr
         pytest.param("\\begin{align} x &= 1 \\\\ y &= 2 \\end{align}", id="align"),
         pytest.param("\\begin{align} x &= 1 \\nonumber \\\\ y &= 2 \\end{align}", id="align-nonumber"),
         pytest.param("\\begin{align} x &= 1 \\notag \\\\ y &= 2 \\end{align}", id="align-notag"),
+        pytest.param("\\begin{align} x &= 1 \\tag{A} \\\\ y &= 2 \\end{align}", id="align-tag"),
+        pytest.param(r"\begin{align} a \\ \tag{X} \end{align}", id="align-tag-only-row"),
+        pytest.param(r"\begin{align} \tag{X} \end{align}", id="align-tag-only"),
         pytest.param(
             r"\newenvironment{wrapper}{a +}{+ c} \begin{wrapper} b \end{wrapper}",
             id="newenvironment-multi-node",
@@ -523,3 +551,279 @@ def test_convert_to_element_with_parent(snapshot: str) -> None:
     parent = Element("div")
     convert_to_element("1", parent=parent)
     assert tostring(parent, encoding="unicode") == snapshot
+
+
+def test_cached_convert() -> None:
+    from latex2mathml.converter import cached_convert
+
+    cached_convert.cache_clear()
+    assert cached_convert(r"\frac{1}{2}", display="block") == convert(r"\frac{1}{2}", display="block")
+    cached_convert(r"\frac{1}{2}", display="block")
+    assert cached_convert.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    "latex, expected",
+    [
+        pytest.param("x", 0, id="no-align"),
+        pytest.param(r"\begin{align*} a &= 1 \\ b &= 2 \end{align*}", 0, id="align-star"),
+        pytest.param(r"\begin{align} a &= 1 \\ b &= 2 \end{align}", 2, id="align"),
+        pytest.param(r"\begin{align} a &= 1 \\ \end{align}", 1, id="trailing-newline"),
+        pytest.param(r"\begin{align} a &= 1 \\ b & \end{align}", 2, id="trailing-placeholder-cell"),
+        pytest.param(r"\begin{align} a &= 1 & \end{align}", 0, id="trailing-empty-cell"),
+        pytest.param(r"\begin{align} a \nonumber \\ b \notag \\ c \end{align}", 1, id="nonumber-notag"),
+        pytest.param(r"\begin{align} a \tag{1} \\ b \tag*{B} \\ c \end{align}", 1, id="tag"),
+        pytest.param(r"\begin{align} a \\ \tag{X} \end{align}", 1, id="tag-only-row"),
+        pytest.param(r"\begin{align} a \\ \hline \rm \end{align}", 1, id="no-content"),
+        pytest.param(r"\begin{align}\end{align}", 0, id="empty"),
+        pytest.param(
+            r"\left( \begin{align} a & {\begin{align} b \\ c \end{align}} \end{align} \right)", 3, id="nested"
+        ),
+    ],
+)
+def test_count_equations(latex: str, expected: int) -> None:
+    assert count_equations(latex, display="block") == expected
+    converter = Converter(display="block")
+    converter.convert(latex)
+    assert converter.equation_counter == expected
+
+
+def test_equation_counters() -> None:
+    document = [
+        r"\newcommand{\eq}[1]{\begin{align} #1 &= 1 \\ #1 &= 2 \end{align}}",
+        r"\eq{a}",
+        "x",
+        r"\begin{align} b &= 1 \nonumber \\ c &= 2 \end{align}",
+        r"\eq{d}",
+    ]
+    counters = equation_counters(document, display="block")
+    assert counters == [0, 0, 2, 2, 3]
+
+    sequential = Converter(display="block")
+    expected = [sequential.convert(latex) for latex in document]
+    macros = document[0]
+    assert [
+        convert(latex if i == 0 else macros + latex, display="block", equation_counter=counter)
+        for i, (latex, counter) in enumerate(zip(document, counters))
+    ] == expected
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        pytest.param("x", id="no-align"),
+        pytest.param(r"\begin{align} a &= 1 \\ b &= 2 \tag{B} \\ c &= 3 \end{align}", id="align"),
+        pytest.param(r"\begin{align} a & {\begin{align} b \\ c \end{align}} \\ d \end{align}", id="nested"),
+        pytest.param("\\text{(\ufffc)} \\begin{align} a \\\\ \\text{(\ufffc)} \\end{align}", id="placeholder-text"),
+    ],
+)
+@pytest.mark.parametrize("equation_counter", [0, 9, 99])
+def test_renumber_equations(latex: str, equation_counter: int) -> None:
+    mathml, index = convert_with_equation_index(latex, display="block")
+    assert len(index) == count_equations(latex, display="block")
+    assert renumber_equations(mathml, index, equation_counter) == convert(
+        latex, display="block", equation_counter=equation_counter
+    )
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        pytest.param(r"\frac{1}{2} + \alpha", id="symbols"),
+        pytest.param("x \u2264 \u00e9", id="non-ascii"),
+        pytest.param(r'\text{a<b&c "q"} \mathrm{T}', id="text-escapes"),
+        pytest.param(r'\color{a&"b}{x}', id="attribute-escapes"),
+        pytest.param(r"\begin{align} a &= 1 \\ b &= 2 \end{align}", id="align"),
+    ],
+)
+def test_convert_bytes(latex: str) -> None:
+    data = latex.encode()
+    expected = convert(latex, display="block", equation_counter=3).encode()
+    element = convert_to_element(latex, display="block", equation_counter=3)
+    assert expected == unescape(tostring(element, encoding="unicode")).encode()
+    assert convert_bytes(data, display="block", equation_counter=3) == expected
+    assert convert_bytes(memoryview(data), display="block", equation_counter=3) == expected
+    assert convert_bytes(bytearray(data), display="block", equation_counter=3) == expected
+
+
+def test_convert_bytes_invalid_utf8() -> None:
+    with pytest.raises(UnicodeDecodeError):
+        convert_bytes(b"\xff")
+
+
+@pytest.mark.parametrize(
+    "output_encoding, expected",
+    [
+        pytest.param(NUMERIC, "<mi>&#x003B1;</mi><mo>&#x02192;</mo><mtext>\u00e9&#x000A0;b</mtext>", id="numeric"),
+        pytest.param(UNICODE, "<mi>\u03b1</mi><mo>\u2192</mo><mtext>\u00e9\u00a0b</mtext>", id="unicode"),
+        pytest.param(ASCII, "<mi>&#x003B1;</mi><mo>&#x02192;</mo><mtext>&#x000E9;&#x000A0;b</mtext>", id="ascii"),
+    ],
+)
+def test_output_encoding(output_encoding: str, expected: str) -> None:
+    mathml = convert("\\alpha \\to \\text{\u00e9 b}", output_encoding=output_encoding)
+    assert mathml.endswith(f"<mrow>{expected}</mrow></math>")
+    assert convert_bytes("\\alpha \\to \\text{\u00e9 b}".encode(), output_encoding=output_encoding) == mathml.encode()
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        pytest.param(r"a \lt b \gt c \& d", id="markup-characters"),
+        pytest.param(r"\mathbb{R} \times \mathfrak{g} \quad \sum_{i}^{\infty}", id="symbols"),
+        pytest.param(r"\color{\u00e9}{x} \text{\u00e9}", id="attribute"),
+    ],
+)
+@pytest.mark.parametrize("output_encoding", OUTPUT_ENCODINGS)
+def test_output_encoding_same_characters(latex: str, output_encoding: str) -> None:
+    mathml = convert(latex, output_encoding=output_encoding)
+    assert html.unescape(mathml) == html.unescape(convert(latex))
+    assert "&#x0003C;" in mathml or "\\lt" not in latex
+    if output_encoding == ASCII:
+        assert mathml.isascii()
+    elif output_encoding == UNICODE:
+        assert set(REFERENCE_PATTERN.findall(mathml)) <= {"0003C", "0003E", "00026"}
+
+
+@pytest.mark.parametrize("output_encoding", OUTPUT_ENCODINGS)
+def test_output_encoding_out_of_range_reference(output_encoding: str) -> None:
+    assert convert(r"\unicode{x110000} x", output_encoding=output_encoding) == convert(r"\unicode{x110000} x")
+
+
+@pytest.mark.parametrize(
+    "latex, expected",
+    [
+        pytest.param(".5", "<mn>.5</mn>", id="leading-dot"),
+        pytest.param("-3cm", "<mn>-3cm</mn>", id="negative-dimension"),
+        pytest.param(r"\newcommand{\n}{12} \n", "<mn>12</mn>", id="macro"),
+        pytest.param(r"\not\in", "<mo>&#x02209;</mo>", id="negated"),
+    ],
+)
+def test_token_kinds(latex: str, expected: str) -> None:
+    assert (
+        convert(latex)
+        == f'<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline"><mrow>{expected}</mrow></math>'
+    )
+
+
+def test_output_encoding_unknown() -> None:
+    with pytest.raises(ValueError):
+        Converter(output_encoding="utf-8")
+
+
+@pytest.mark.parametrize("output_encoding", OUTPUT_ENCODINGS)
+def test_converter_tree(output_encoding: str) -> None:
+    latex = r"\alpha \to \text{caf\u00e9}"
+    converter = Converter(display="block", output_encoding=output_encoding)
+    expected = convert(latex, display="block", output_encoding=output_encoding)
+    tree = converter.convert_to_tree(latex)
+    assert converter.serialize(tree) == expected
+    parts: list[str] = []
+    converter.write_tree(tree, parts.append)
+    assert "".join(parts) == expected
+    assert converter.convert_bytes(latex.encode()) == expected.encode()
+    stream = io.StringIO()
+    converter.write(latex, stream)
+    assert stream.getvalue() == expected
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        pytest.param(r"\frac{1}{2} + \alpha", id="symbols"),
+        pytest.param(r"\text{caf\u00e9} \begin{align} a &= 1 \\ b &= 2 \end{align}", id="non-ascii"),
+        pytest.param(" + ".join([r"\alpha_1"] * 500), id="several-writes"),
+    ],
+)
+@pytest.mark.parametrize("output_encoding", OUTPUT_ENCODINGS)
+def test_convert_to_stream(latex: str, output_encoding: str, tmp_path: Path) -> None:
+    expected = convert(latex, display="block", equation_counter=1, output_encoding=output_encoding)
+    text = io.StringIO()
+    convert_to_stream(latex, text, display="block", equation_counter=1, output_encoding=output_encoding)
+    assert text.getvalue() == expected
+    binary = io.BytesIO()
+    convert_to_stream(latex, binary, display="block", equation_counter=1, output_encoding=output_encoding)
+    assert binary.getvalue() == expected.encode()
+    path = tmp_path / "output.html"
+    with open(path, "wb") as f:
+        convert_to_stream(latex, f, display="block", equation_counter=1, output_encoding=output_encoding)
+    assert path.read_bytes() == expected.encode()
+
+
+DOCUMENT = [
+    r"\newcommand{\vect}[1]{\mathbf{#1}} \vect{v} \to \infty",
+    r"\begin{align} \vect{a} &< 1 \\ b &= 2 \end{align}",
+    r"\begin{align} c &= 3 \end{align} \text{a & b}",
+]
+
+
+@pytest.mark.parametrize("namespace", [NAMESPACE_ATTRIBUTE, NAMESPACE_QUALIFIED, NAMESPACE_NONE])
+def test_convert_many_to_element(namespace: str) -> None:
+    body = Element("body")
+    elements = convert_many_to_element(DOCUMENT, body, display="block", namespace=namespace)
+    assert list(body) == elements
+    assert all(element.attrib is elements[0].attrib for element in elements)
+
+    converter = Converter(display="block")
+    expected = [html.unescape(converter.convert(latex)) for latex in DOCUMENT]
+    page = tostring(body, encoding="unicode")
+    if namespace == NAMESPACE_ATTRIBUTE:
+        assert [html.unescape(tostring(element, encoding="unicode")) for element in elements] == expected
+    elif namespace == NAMESPACE_QUALIFIED:
+        assert page.count("xmlns") == 1 and page.startswith('<body xmlns:ns0="http://www.w3.org/1998/Math/MathML">')
+        page = page.replace(' xmlns:ns0="http://www.w3.org/1998/Math/MathML"', "").replace("ns0:", "")
+        assert html.unescape(page) == "<body>{}</body>".format(
+            "".join(mathml.replace(' xmlns="http://www.w3.org/1998/Math/MathML"', "") for mathml in expected)
+        )
+    else:
+        assert "xmlns" not in page and "&amp;#x" not in page
+
+
+def test_convert_many_to_element_unknown_namespace() -> None:
+    with pytest.raises(ValueError):
+        convert_many_to_element(["x"], Element("body"), namespace="prefix")
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_alttext_and_annotation(optimize: bool) -> None:
+    latex = r"\frac{a}{b} < c \& d"
+    mathml = Converter(alttext=True, annotation=True, optimize=optimize).convert(latex)
+    escaped = r"\frac{a}{b} &#x0003C; c \&#x00026; d"
+    assert mathml.startswith(f'<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline" alttext="{escaped}">')
+    assert mathml.endswith(f'<annotation encoding="application/x-tex">{escaped}</annotation></semantics></math>')
+    root = fromstring(mathml)
+    assert root.get("alttext") == root[0][1].text == latex
+    assert len(root) == 1 and len(root[0]) == 2
+
+    body = mathml[mathml.index("<semantics>") + len("<semantics>") : mathml.index("<annotation")]
+    if optimize:  # the `mrow` stays, as `semantics` takes a single element
+        body = body[len("<mrow>") : -len("</mrow>")]
+    assert (
+        convert(latex, optimize=optimize)
+        == f'<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline">{body}</math>'
+    )
+
+
+@pytest.mark.parametrize(
+    "latex, expected",
+    [
+        pytest.param(r"\mathbf{AB}", "<mrow><mi>&#x1D400;</mi><mi>&#x1D401;</mi></mrow>", id="letters"),
+        pytest.param(
+            r"\mathbf{x+1}",
+            '<mrow><mi>&#x1D431;</mi><mo mathvariant="bold">&#x0002B;</mo><mn>&#x1D7CF;</mn></mrow>',
+            id="operator",
+        ),
+        pytest.param(
+            r"{\cal L} \mathbb{1}", "<mrow><mi>&#x02112;</mi></mrow><mrow><mn>&#x1D7D9;</mn></mrow>", id="global"
+        ),
+        pytest.param(r"\boldsymbol{\alpha}", "<mrow><mi>&#x1D736;</mi></mrow>", id="greek"),
+        pytest.param(r"\mathrm{d}x", "<mi>&#x00064;</mi><mi>x</mi>", id="normal"),
+        pytest.param(
+            r"\mathrm{dx}", '<mrow><mi mathvariant="normal">d</mi><mi mathvariant="normal">x</mi></mrow>', id="upright"
+        ),
+        pytest.param(r"\mathbf{\text{ab}}", '<mrow><mtext mathvariant="bold">ab</mtext></mrow>', id="text"),
+    ],
+)
+def test_math_alphanumerics(latex: str, expected: str) -> None:
+    assert convert(latex, math_alphanumerics=True) == (
+        f'<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline"><mrow>{expected}</mrow></math>'
+    )
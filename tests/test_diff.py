@@ -0,0 +1,79 @@
+import copy
+import json
+from xml.etree.ElementTree import tostring
+
+import pytest
+
+from latex2mathml.converter import convert_to_element
+from latex2mathml.diff import (
+    INSERT,
+    REMOVE,
+    REPLACE,
+    SET_ATTRIBUTE,
+    SET_TEXT,
+    Patch,
+    apply_patches,
+    convert_to_patches,
+    diff,
+    serialize_patches,
+)
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        pytest.param("x", "x", id="same"),
+        pytest.param("x + y", "x + z", id="text"),
+        pytest.param("x + y", "x + 2 + y", id="insert"),
+        pytest.param("x + 2 + y", "x + y", id="remove"),
+        pytest.param(r"\frac{a}{b}", r"\sqrt{a}", id="replace"),
+        pytest.param(r"\color{red}{x}", r"\color{blue}{x}", id="attribute"),
+        pytest.param(r"\begin{matrix}1&2\\3&4\end{matrix}", r"\begin{matrix}1&2\\3&5\\6&7\end{matrix}", id="matrix"),
+        pytest.param(r"\left(x\right)", "y^2", id="unrelated"),
+        pytest.param("x", r"\sum_{i=0}^n i", id="sum"),
+    ],
+)
+def test_diff(old: str, new: str) -> None:
+    old_element, new_element = convert_to_element(old), convert_to_element(new)
+    patches = diff(old_element, new_element)
+    assert tostring(apply_patches(copy.deepcopy(old_element), patches)) == tostring(new_element)
+    json.dumps(serialize_patches(patches))
+    if old == new:
+        assert patches == []
+
+
+def test_diff_patches() -> None:
+    element, patches = convert_to_patches("x + 2 + z", convert_to_element(r"x + y", display="block"))
+    assert patches == [
+        Patch(SET_ATTRIBUTE, (), "inline", "display"),
+        Patch(REPLACE, (0, 2), element[0][2]),
+        Patch(INSERT, (0, 3), element[0][3]),
+        Patch(INSERT, (0, 4), element[0][4]),
+    ]
+    assert serialize_patches(patches)[1:] == [
+        {"op": REPLACE, "path": [0, 2], "value": "<mn>2</mn>"},
+        {"op": INSERT, "path": [0, 3], "value": "<mo>&#x0002B;</mo>"},
+        {"op": INSERT, "path": [0, 4], "value": "<mi>z</mi>"},
+    ]
+
+
+def test_diff_remove_and_text() -> None:
+    patches = diff(convert_to_element("a + b + c"), convert_to_element("a"))
+    assert patches == [Patch(REMOVE, (0, 4)), Patch(REMOVE, (0, 3)), Patch(REMOVE, (0, 2)), Patch(REMOVE, (0, 1))]
+    assert diff(convert_to_element("a"), convert_to_element("b")) == [Patch(SET_TEXT, (0, 0), "b")]
+
+
+def test_serialize_patches_decodes_references() -> None:
+    patches = diff(convert_to_element("x + y"), convert_to_element(r"x - y \,"))
+    assert patches[0] == Patch(SET_TEXT, (0, 1), "&#x02212;")
+    assert serialize_patches(patches)[0] == {"op": SET_TEXT, "path": [0, 1], "value": "\u2212"}
+    patches = [Patch(SET_ATTRIBUTE, (0,), "&#x02212;1em", "width"), Patch(SET_ATTRIBUTE, (0,), None, "height")]
+    assert serialize_patches(patches) == [
+        {"op": SET_ATTRIBUTE, "path": [0], "name": "width", "value": "\u22121em"},
+        {"op": SET_ATTRIBUTE, "path": [0], "name": "height", "value": None},
+    ]
+
+
+def test_apply_patches_unknown_operation() -> None:
+    with pytest.raises(ValueError):
+        apply_patches(convert_to_element("x"), [Patch("move", (0,))])
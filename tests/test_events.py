@@ -0,0 +1,45 @@
+from xml.dom import minidom
+from xml.dom.pulldom import SAX2DOM
+from xml.etree.ElementTree import Element, TreeBuilder, fromstring
+
+import pytest
+
+from latex2mathml.converter import convert
+from latex2mathml.events import convert_to_events
+
+LATEX = [
+    pytest.param(r"\frac{1}{2} + \alpha", id="symbols"),
+    pytest.param(r"a \lt b \gt c \& d", id="markup-characters"),
+    pytest.param(r"\text{café au lait} \mathbb{R}", id="text"),
+    pytest.param(r"\color{red}{x} \sqrt[3]{y}", id="attributes"),
+    pytest.param(r"\begin{align} a &= 1 \\ b &= 2 \end{align}", id="align"),
+]
+
+
+def _items(element: Element) -> list[tuple[str, dict[str, str], str, str]]:
+    return [
+        (
+            item.tag.rpartition("}")[2],
+            {k: v for k, v in item.attrib.items() if k != "xmlns"},
+            item.text or "",
+            item.tail or "",
+        )
+        for item in element.iter()
+    ]
+
+
+@pytest.mark.parametrize("latex", LATEX)
+def test_tree_builder(latex: str) -> None:
+    element = convert_to_events(latex, TreeBuilder(), display="block", equation_counter=2)
+    expected = fromstring(convert(latex, display="block", equation_counter=2))
+    assert _items(element) == _items(expected)
+    assert element.get("xmlns") == "http://www.w3.org/1998/Math/MathML"
+
+
+@pytest.mark.parametrize("latex", LATEX)
+def test_content_handler(latex: str) -> None:
+    handler = SAX2DOM()
+    assert convert_to_events(latex, handler, optimize=True) is None
+    expected = minidom.parseString(convert(latex, optimize=True))
+    assert handler.document is not None
+    assert handler.document.toxml() == expected.toxml()
@@ -0,0 +1,30 @@
+import pytest
+
+from latex2mathml.fonts import VARIANTS, math_alphanumerics, style
+
+
+@pytest.mark.parametrize(
+    "text, mathvariant, expected",
+    [
+        pytest.param("A", "bold", "&#x1D400;", id="bold"),
+        pytest.param("sin", "bold", "&#x1D42C;&#x1D422;&#x1D427;", id="word"),
+        pytest.param("&#x003B1;", "bold-italic", "&#x1D736;", id="greek"),
+        pytest.param("1", "double-struck", "&#x1D7D9;", id="digit"),
+        pytest.param("h", "italic", "&#x0210E;", id="planck-constant"),
+        pytest.param("R", "double-struck", "&#x0211D;", id="letterlike"),
+        pytest.param("B", "script", "&#x0212C;", id="script"),
+        pytest.param("1.5", "bold", None, id="decimal-point"),
+        pytest.param("+", "bold", None, id="operator"),
+        pytest.param("&#x003B1;", "script", None, id="no-greek"),
+        pytest.param("x", "normal", None, id="normal"),
+    ],
+)
+def test_style(text: str, mathvariant: str, expected: str) -> None:
+    assert style(text, mathvariant) == expected
+
+
+@pytest.mark.parametrize("mathvariant", VARIANTS)
+def test_math_alphanumerics(mathvariant: str) -> None:
+    table = math_alphanumerics(mathvariant)
+    assert all(character in table for character in "AZaz")
+    assert len(set(table.values())) == len(table)
@@ -0,0 +1,170 @@
+import random
+
+import pytest
+
+from latex2mathml.converter import convert
+from latex2mathml.exceptions import MissingSuperScriptOrSubscriptError
+from latex2mathml.incremental import Session
+
+ALIGN = r"x = \begin{align} a &= b \\ c &= d^2 \\ e &= \frac{1}{2} \end{align} + y"
+
+
+@pytest.mark.parametrize(
+    "latex, display",
+    [
+        pytest.param(ALIGN, "block", id="align"),
+        pytest.param(
+            r"\begin{matrix} 1 & 2 \\ 3 & 4 \end{matrix}\begin{pmatrix}a\cr b\end{pmatrix}", "inline", id="two"
+        ),
+        pytest.param(r"\begin{array}{cr} 1 & 2 \\ 3 & 4 \end{array}", "inline", id="array"),
+        pytest.param(r"\begin{bmatrix}[r] 1 & 2 \\ 3 & 4 \end{bmatrix}^2", "inline", id="postfix"),
+        pytest.param(r"\frac{a}{b}", "inline", id="no-environment"),
+    ],
+)
+def test_convert(latex: str, display: str) -> None:
+    assert Session(display=display).convert(latex) == convert(latex, display=display)
+
+
+@pytest.mark.parametrize(
+    "target, inserted",
+    [
+        pytest.param("d^2", "x", id="symbol"),
+        pytest.param("d^2", r"\sqrt{2}", id="group"),
+        pytest.param("d^2", r"\tag{7}", id="tag"),
+        pytest.param("d^2", r"\\ f &= g", id="new-row"),
+        pytest.param("d^2", r"\over", id="over"),
+        pytest.param("d^2", "{", id="open-brace"),
+        pytest.param("d^2", r"\newcommand{\d}{x}", id="macro"),
+        pytest.param("d^2", "% comment", id="comment"),
+        pytest.param("a &", "^", id="postfix"),
+        pytest.param("align}", "*}", id="environment"),
+        pytest.param("+ y", "z", id="outside"),
+    ],
+)
+def test_edit(target: str, inserted: str) -> None:
+    session = Session(display="block")
+    session.convert(ALIGN)
+    offset = ALIGN.index(target)
+    latex = ALIGN[:offset] + inserted + ALIGN[offset + len(target) :]
+    try:
+        expected = convert(latex, display="block")
+    except Exception as e:
+        with pytest.raises(type(e)):
+            session.edit(offset, len(target), inserted)
+    else:
+        assert session.edit(offset, len(target), inserted) == expected
+        assert session.latex == latex
+
+
+@pytest.mark.parametrize(
+    "latex, target, removed, inserted",
+    [
+        pytest.param(r"\begin{align} a \\ x^2 \end{align}", "x", 1, "", id="postfix-digit"),
+        pytest.param(r"\begin{matrix} a \\ b \end{matrix}", " a", 0, "[", id="preamble-bracket"),
+        pytest.param(r"\begin{matrix} a \\ b \end{matrix}", " a", 0, "{", id="preamble-brace"),
+        pytest.param(
+            r"\begin{matrix} \mathrm{ab} & \rm c \\ \verb|]& \text{a b} \\ 1.5 & \hline 2 \end{matrix}",
+            "line 2",
+            1,
+            "|",
+            id="verb-across-rows",
+        ),
+    ],
+)
+def test_edit_context(latex: str, target: str, removed: int, inserted: str) -> None:
+    session = Session()
+    session.convert(latex)
+    offset = latex.index(target)
+    _assert_edit(session, latex, offset, removed, inserted, "inline")
+
+
+RANDOM_BASES = [
+    ALIGN,
+    r"\begin{matrix} 1 & 2 \\ 3 & 4 \end{matrix}\begin{pmatrix}a\cr b\end{pmatrix}",
+    r"\begin{array}{cr} 1 & 2 \\ 3 & 4 \end{array}",
+    r"\begin{bmatrix}[r] 1 & 2 \\ 3 & 4 \end{bmatrix}^2",
+    r"\begin{align} a \\ x^2 \end{align}",
+    r"\begin{cases} x & x > 0 \\ -x & \text{else} \end{cases}",
+]
+RANDOM_FRAGMENTS = [
+    *"x2'[]{}&^_ |%",
+    r"\verb|",
+    "^2",
+    "_1",
+    r"\\",
+    r"\cr",
+    r"\tag{1}",
+    r"\limits",
+    r"\sum",
+    r"\frac{a}{b}",
+    r"\left(",
+    r"\right)",
+    r"\nonumber",
+    r"\hline",
+]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_edit_random(seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(20):
+        display = rng.choice(["inline", "block"])
+        latex = rng.choice(RANDOM_BASES)
+        session = Session(display=display)
+        session.convert(latex)
+        for _ in range(5):
+            offset = rng.randrange(len(latex) + 1)
+            removed = rng.randrange(min(3, len(latex) - offset) + 1)
+            inserted = rng.choice(RANDOM_FRAGMENTS) if rng.random() < 0.8 else ""
+            if not _assert_edit(session, latex, offset, removed, inserted, display):
+                break
+            latex = latex[:offset] + inserted + latex[offset + removed :]
+
+
+def _assert_edit(session: Session, latex: str, offset: int, removed: int, inserted: str, display: str) -> bool:
+    edited = latex[:offset] + inserted + latex[offset + removed :]
+    try:
+        expected = convert(edited, display=display)
+    except Exception as e:
+        with pytest.raises(type(e)):
+            session.edit(offset, removed, inserted)
+        return False
+    assert session.edit(offset, removed, inserted) == expected, (latex, offset, removed, inserted)
+    return True
+
+
+def test_edit_sequence() -> None:
+    session = Session()
+    latex = r"\begin{matrix} 1 & 2 \\ 3 & 4 \end{matrix} + \begin{cases} a \cr b \end{cases}"
+    session.convert(latex)
+    for target, removed, inserted in [("2", 1, "x"), ("4", 0, r"\cr"), ("b", 1, "b_1"), ("1", 1, r"\frac{1}{2}")]:
+        offset = latex.index(target)
+        latex = latex[:offset] + inserted + latex[offset + removed :]
+        assert session.edit(offset, removed, inserted) == convert(latex)
+
+
+def test_edit_reuses_rows() -> None:
+    session = Session(display="block")
+    session.convert(ALIGN)
+    first_row = session.nodes[2].children[:4]  # type: ignore[index]
+    offset = ALIGN.index("d^2")
+    session.edit(offset, 1, "z")
+    assert session.nodes[2].children[:4] == first_row  # type: ignore[index]
+    assert all(a is b for a, b in zip(session.nodes[2].children[:4], first_row))  # type: ignore[index]
+
+
+def test_edit_tokens_merged_with_separator() -> None:
+    latex = r"\begin{matrix} a \cr b \end{matrix}"
+    session = Session()
+    session.convert(latex)
+    offset = latex.index(r"\cr") + 3
+    assert session.edit(offset, 1, "x") == convert(latex[:offset] + "x" + latex[offset + 1 :])
+
+
+def test_edit_error() -> None:
+    session = Session(display="block")
+    session.convert(ALIGN)
+    with pytest.raises(MissingSuperScriptOrSubscriptError):
+        session.edit(len(ALIGN), 0, "^")
+    with pytest.raises(IndexError):
+        session.edit(len(ALIGN), 1, "")
@@ -0,0 +1,53 @@
+import pytest
+
+from latex2mathml.converter import cached_convert, convert
+from latex2mathml.lazy import LazyMathML
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    cached_convert.cache_clear()
+
+
+def test_converts_only_when_rendered() -> None:
+    formulas = [LazyMathML(rf"x^{{{index}}}") for index in range(3)]
+    assert cached_convert.cache_info().misses == 0
+    assert not any(formula.converted for formula in formulas)
+
+    assert str(formulas[1]) == convert("x^{1}")
+    assert cached_convert.cache_info().misses == 1
+    assert [formula.converted for formula in formulas] == [False, True, False]
+
+
+def test_memoizes_result() -> None:
+    formula = LazyMathML(r"\frac{1}{2}", display="block")
+    first = str(formula)
+    assert str(formula) is first
+    assert formula.__html__() is first
+    assert cached_convert.cache_info().hits + cached_convert.cache_info().misses == 1
+
+
+def test_shares_result_cache() -> None:
+    assert str(LazyMathML("a+b")) == str(LazyMathML("a+b"))
+    assert cached_convert.cache_info().misses == 1
+    assert cached_convert.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    "latex, display",
+    [
+        pytest.param(r"\sqrt{2}", "inline", id="inline"),
+        pytest.param(r"\sum_{i=1}^{n} i", "block", id="block"),
+    ],
+)
+def test_matches_convert(latex: str, display: str) -> None:
+    formula = LazyMathML(latex, display=display)
+    assert f"{formula}" == convert(latex, display=display)
+    assert formula.__html__() == convert(latex, display=display)
+
+
+def test_equality() -> None:
+    assert LazyMathML("x") == LazyMathML("x")
+    assert LazyMathML("x") != LazyMathML("x", display="block")
+    assert len({LazyMathML("x"), LazyMathML("x")}) == 1
+    assert repr(LazyMathML("x")) == "LazyMathML('x', display='inline')"
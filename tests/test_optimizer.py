@@ -0,0 +1,63 @@
+from xml.etree.ElementTree import Element
+
+import pytest
+
+from latex2mathml.converter import Converter, convert, convert_to_element
+from latex2mathml.optimizer import optimize
+
+MATH = '<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline">'
+
+
+@pytest.mark.parametrize(
+    "latex, expected",
+    [
+        pytest.param("x", "<mi>x</mi>", id="root"),
+        pytest.param("{{a}}", "<mi>a</mi>", id="nested-single"),
+        pytest.param(r"\frac{a}{b}", "<mfrac><mi>a</mi><mi>b</mi></mfrac>", id="frac"),
+        pytest.param(
+            r"\frac{a+1}{b}",
+            "<mfrac><mrow><mi>a</mi><mo>&#x0002B;</mo><mn>1</mn></mrow><mi>b</mi></mfrac>",
+            id="frac-row",
+        ),
+        pytest.param("x^{2}", "<msup><mi>x</mi><mn>2</mn></msup>", id="script"),
+        pytest.param(r"\sqrt{x+1}", "<msqrt><mi>x</mi><mo>&#x0002B;</mo><mn>1</mn></msqrt>", id="inferred"),
+        pytest.param("{x y} - z", "<mi>x</mi><mi>y</mi><mo>&#x02212;</mo><mi>z</mi>", id="group-without-operator"),
+        pytest.param("a {-b}", "<mi>a</mi><mrow><mo>&#x02212;</mo><mi>b</mi></mrow>", id="group-with-operator"),
+        pytest.param("a{-}b", "<mi>a</mi><mrow><mo>&#x02212;</mo></mrow><mi>b</mi>", id="braced-operator"),
+        pytest.param("a{}-b", "<mi>a</mi><mrow /><mo>&#x02212;</mo><mi>b</mi>", id="empty-group"),
+        pytest.param(
+            r"\left(a\right) + 1",
+            '<mrow><mo stretchy="true" fence="true" form="prefix">&#x00028;</mo><mi>a</mi>'
+            '<mo stretchy="true" fence="true" form="postfix">&#x00029;</mo></mrow><mo>&#x0002B;</mo><mn>1</mn>',
+            id="fences",
+        ),
+    ],
+)
+def test_optimize(latex: str, expected: str) -> None:
+    assert convert(latex, optimize=True) == f"{MATH}{expected}</math>"
+
+
+def test_optimize_keeps_attributes() -> None:
+    element = Element("mrow")
+    row = Element("mrow", mathcolor="red")
+    row.append(Element("mi"))
+    element.append(row)
+    assert optimize(element)[0] is row
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        pytest.param(r"\sum_{i=0}^{n} \frac{\sqrt{a_i}}{1 + b_{i}^{2}}", id="scripts"),
+        pytest.param(r"\begin{align} a &= {b + c} \\ d &= \left\{ e \right. \end{align}", id="align"),
+        pytest.param(r"\hphantom{x} \overbrace{a + b}^{n} \mathbf{\{x\}}", id="commands"),
+    ],
+)
+def test_optimize_keeps_leaves(latex: str) -> None:
+    def leaves(element: Element) -> list[tuple[str, dict, str]]:
+        return [(item.tag, item.attrib, item.text or "") for item in element.iter() if item.tag != "mrow"]
+
+    element = convert_to_element(latex, display="block")
+    optimized = convert_to_element(latex, display="block", optimize=True)
+    assert leaves(optimized) == leaves(element)
+    assert Converter().serialize(optimized) == Converter().serialize(optimize(element))
@@ -0,0 +1,55 @@
+import pytest
+
+from latex2mathml.converter import Converter, convert
+from latex2mathml.speech import symbol_words
+
+
+@pytest.mark.parametrize(
+    "latex, expected",
+    [
+        pytest.param(r"\frac{a+b}{2} < c", "fraction a plus b over 2 end fraction less than c", id="frac"),
+        pytest.param(r"x_i^2", "x subscript i superscript 2 end scripts", id="subsup"),
+        pytest.param(r"\sqrt[3]{x}", "root index 3 of x end root", id="root"),
+        pytest.param(r"\binom{n}{k}", "binomial n choose k end binomial", id="binom"),
+        pytest.param(r"\left( \alpha \right)", "open paren alpha close paren", id="left-right"),
+        pytest.param(
+            r"\begin{pmatrix} a & b \\ c & d \end{pmatrix}",
+            "matrix a next cell b next row c next cell d",
+            id="matrix",
+        ),
+        pytest.param(r"\text{if } x \geq 0", "if x greater than or equal to 0", id="text"),
+        pytest.param(r"\mathrm{d}x \operatorname{sn} x", "d x sn x", id="fonts"),
+        pytest.param(
+            r"\lim_{x\to0} f''",
+            "limit subscript x right arrow 0 end subscript f superscript double prime end superscript",
+            id="limit",
+        ),
+        pytest.param(r"\frac{1}", "1", id="missing-argument"),
+        pytest.param(r"\color{red} x \, \unicode{x2200}", "x for all", id="unspoken"),
+    ],
+)
+def test_speech(latex: str, expected: str) -> None:
+    converter = Converter(speech=True)
+    assert converter.convert(latex) == convert(latex)
+    assert converter.speech_text == expected
+
+
+def test_speech_disabled() -> None:
+    converter = Converter()
+    converter.convert("x")
+    assert converter.speech_text is None
+
+
+@pytest.mark.parametrize(
+    "token, symbol, expected",
+    [
+        pytest.param("+", None, "plus", id="word"),
+        pytest.param(r"\Gamma", "00393", "Gamma", id="command"),
+        pytest.param("&#x1D400;", None, "A", id="reference"),
+        pytest.param("3.14", None, "3.14", id="number"),
+        pytest.param("@", None, "commercial at", id="character"),
+        pytest.param("", None, "", id="empty"),
+    ],
+)
+def test_symbol_words(token: str, symbol: str, expected: str) -> None:
+    assert symbol_words(token, symbol) == expected
@@ -0,0 +1,41 @@
+import sqlite3
+
+import pytest
+
+from latex2mathml.converter import convert
+from latex2mathml.sqlite import register_function
+
+
+@pytest.fixture
+def connection() -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:")
+    register_function(connection)
+    return connection
+
+
+@pytest.mark.parametrize(
+    "query, args, expected",
+    [
+        pytest.param("SELECT latex2mathml(?)", (r"\frac{1}{2}",), convert(r"\frac{1}{2}"), id="inline"),
+        pytest.param("SELECT latex2mathml(?, ?)", ("x^2", "block"), convert("x^2", display="block"), id="block"),
+        pytest.param("SELECT latex2mathml(?, NULL)", ("x",), convert("x"), id="null-display"),
+        pytest.param("SELECT latex2mathml(NULL)", (), None, id="null-latex"),
+    ],
+)
+def test_register_function(connection: sqlite3.Connection, query: str, args: tuple, expected: str) -> None:
+    assert connection.execute(query, args).fetchone()[0] == expected
+
+
+def test_bulk_update(connection: sqlite3.Connection) -> None:
+    formulas = ["x", r"\alpha + \beta", r"\sqrt{2}", "x"]
+    connection.execute("CREATE TABLE formulas (latex TEXT, mathml TEXT)")
+    connection.executemany("INSERT INTO formulas (latex) VALUES (?)", [(f,) for f in formulas])
+    connection.execute("UPDATE formulas SET mathml = latex2mathml(latex)")
+    rows = connection.execute("SELECT latex, mathml FROM formulas").fetchall()
+    assert rows == [(f, convert(f)) for f in formulas]
+
+
+def test_custom_name() -> None:
+    connection = sqlite3.connect(":memory:")
+    register_function(connection, name="tex")
+    assert connection.execute("SELECT tex('1')").fetchone()[0] == convert("1")
@@ -1,6 +1,6 @@
 import pytest
 
-from latex2mathml.symbols_parser import convert_symbol
+from latex2mathml.symbols_parser import convert_symbol, decode_references
 
 
 @pytest.mark.parametrize(
@@ -9,3 +9,16 @@ from latex2mathml.symbols_parser import convert_symbol
 )
 def test_convert_symbol(latex: str, expected: str) -> None:
     assert convert_symbol(latex) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        pytest.param("x", "x", id="plain"),
+        pytest.param("&#x0211D;&#x1d400;", "ℝ𝐀", id="references"),
+        pytest.param("a&#x0003C;b &#x", "a<b &#x", id="unterminated"),
+        pytest.param("&#x110000;&#x10FFFF;", "&#x110000;\U0010ffff", id="out-of-range"),
+    ],
+)
+def test_decode_references(text: str, expected: str) -> None:
+    assert decode_references(text) == expected
@@ -0,0 +1,59 @@
+import re
+
+import pytest
+
+from latex2mathml.converter import OUTPUT_ENCODINGS, convert
+from latex2mathml.template import Template
+
+
+def _fill(latex: str, values: tuple[str, ...]) -> str:
+    return re.sub(
+        r"{#([1-9])}|#([1-9])", lambda match: f"{{{values[int(match.group(1) or match.group(2)) - 1]}}}", latex
+    )
+
+
+@pytest.mark.parametrize(
+    "latex, values",
+    [
+        pytest.param(r"\frac{#1}{#2}\,\mathrm{kg}", ("3.5", "-2"), id="frac"),
+        pytest.param(r"#1^2 + #1", (r"a + \alpha",), id="repeated"),
+        pytest.param(r"x_{#1} = \sqrt[#2]{#3}", ("i", "3", r"\frac{1}{2}"), id="scripts"),
+        pytest.param(r"\left( #1 \right) \times 10^{#2}", ("1.5", "-3"), id="fences"),
+        pytest.param(r"\begin{pmatrix} #1 & #2 \\ 0 & 1 \end{pmatrix}", ("a", "b_1"), id="matrix"),
+        pytest.param(r"\newcommand{\unit}{\,\mathrm{m}} #1 \unit", (r"2\unit",), id="macro"),
+        pytest.param(r"\text{total}: 42", (), id="no-parameters"),
+        pytest.param(r"#1", (r"\begin{align} a \\ b \end{align}",), id="numbered-value"),
+        pytest.param(
+            r"\begin{align} x &= #1 + #1 \\ y &= 2 \end{align}",
+            (r"\begin{align} a \\ b \end{align}",),
+            id="numbered-template-and-value",
+        ),
+    ],
+)
+@pytest.mark.parametrize("output_encoding", OUTPUT_ENCODINGS)
+def test_template(latex: str, values: tuple[str, ...], output_encoding: str) -> None:
+    template = Template(latex, display="block", output_encoding=output_encoding)
+    expected = convert(_fill(latex, values), display="block", output_encoding=output_encoding)
+    assert template.render(*values) == expected
+    assert template.render(*values) == expected
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        pytest.param(r"\mathbf{#1}", id="font"),
+        pytest.param(r"\text{#1}", id="text"),
+        pytest.param(r"\operatorname{#1}", id="operatorname"),
+        pytest.param(r"\operatorname*{#1}", id="operatorname-star"),
+        pytest.param(r"\newcommand{\f}{#1} \f", id="macro-body"),
+        pytest.param(r"#2", id="numbering"),
+    ],
+)
+def test_template_invalid(latex: str) -> None:
+    with pytest.raises(ValueError):
+        Template(latex)
+
+
+def test_template_values() -> None:
+    with pytest.raises(ValueError):
+        Template(r"\frac{#1}{#2}").render("1")
@@ -1,8 +1,30 @@
+import copy
+import io
+import mmap
+import pickle
 import string
+from pathlib import Path
 
 import pytest
 
-from latex2mathml.tokenizer import tokenize
+from latex2mathml.tokenizer import (
+    BEGIN,
+    CHAR,
+    COMMAND,
+    COMMENT,
+    DIMENSION,
+    END,
+    FONT,
+    LETTER,
+    NUMBER,
+    OPERATORNAME,
+    SYMBOL,
+    TEXT,
+    kind_of,
+    tokenize,
+    tokenize_many,
+    tokenize_stream,
+)
 
 
 @pytest.mark.parametrize(
@@ -524,3 +546,136 @@ from latex2mathml.tokenizer import tokenize
 )
 def test_tokenize(latex: str, expected: list) -> None:
     assert list(tokenize(latex)) == expected
+    tokens = list(tokenize(latex, spans=True))
+    assert tokens == expected
+    assert all(0 <= a.start <= a.end <= b.start for a, b in zip(tokens, tokens[1:]))
+
+
+def test_tokenize_spans() -> None:
+    latex = r"\frac12 \verb|a b| \mathbb{R} \begin {matrix} 3 cm"
+    tokens = list(tokenize(latex, spans=True))
+    assert [(token, latex[token.start : token.end]) for token in tokens] == [
+        (r"\frac", r"\frac"),
+        ("1", "1"),
+        ("2", "2"),
+        (r"\verb", r"\verb"),
+        ("a b", "a b"),
+        ("&#x0211D;", r"\mathbb{R}"),
+        (r"\begin{matrix}", r"\begin {matrix}"),
+        ("3cm", "3 cm"),
+    ]
+
+
+@pytest.mark.parametrize("skip_comments", [True, False])
+def test_tokenize_spans_same_tokens(skip_comments: bool) -> None:
+    latex = r"\begin{matrix} x_1 & .5 \\ \text{a} \operatorname{sn} \mathbb{R} \kern3 pt \verb|b| \end{matrix} % note"
+    assert list(tokenize(latex, skip_comments, spans=True)) == list(tokenize(latex, skip_comments))
+
+
+def test_tokenize_kinds() -> None:
+    latex = (
+        r"\begin{matrix} x_1 & .5 \\ \text{a} \operatorname{sn} \mathbb{R} \mathfoo{x} \kern3 pt \end{matrix} % note"
+    )
+    assert [(token, token.kind) for token in tokenize(latex, skip_comments=False, typed=True)] == [
+        (r"\begin{matrix}", BEGIN),
+        ("x", LETTER),
+        ("_", CHAR),
+        ("1", NUMBER),
+        ("&", CHAR),
+        (".5", NUMBER),
+        (r"\\", COMMAND),
+        (r"\text", COMMAND),
+        ("a", TEXT),
+        (r"\operatorname{sn}", OPERATORNAME),
+        ("&#x0211D;", SYMBOL),
+        (r"\mathfoo", FONT),
+        ("{", CHAR),
+        ("x", LETTER),
+        ("}", CHAR),
+        (r"\kern", COMMAND),
+        ("3pt", DIMENSION),
+        (r"\end{matrix}", END),
+        ("% note", COMMENT),
+    ]
+
+
+@pytest.mark.parametrize(
+    "token, expected",
+    [
+        pytest.param("12.5", NUMBER, id="number"),
+        pytest.param(r"\alpha", COMMAND, id="command"),
+        pytest.param(r"\mathbb", FONT, id="font"),
+        pytest.param(r"\mathchoice", COMMAND, id="non-font"),
+        pytest.param(r"\operatorname*{sn}", OPERATORNAME, id="operatorname"),
+        pytest.param("multiprimes", CHAR, id="not-a-token"),
+    ],
+)
+def test_kind_of(token: str, expected: str) -> None:
+    assert kind_of(token) == expected
+
+
+def test_token_copy() -> None:
+    token = next(tokenize(r"\alpha", typed=True))
+    for copied in (pickle.loads(pickle.dumps(token)), copy.deepcopy(token)):
+        assert (copied, copied.kind, copied.start, copied.end) == (token, COMMAND, 0, 6)
+
+
+@pytest.mark.parametrize(
+    "latex_strings",
+    [
+        pytest.param([], id="empty"),
+        pytest.param(["", "x", ""], id="empty-strings"),
+        pytest.param([r"\frac12", "x^2", r"\mathbb{R}", r"\verb|a b|"], id="formulas"),
+        pytest.param(["x % comment", "y"], id="comment"),
+        pytest.param(["x %", "y"], id="percent"),
+        pytest.param([r"\text{a", "b}", "c"], id="unterminated-text"),
+        pytest.param(["a\\", "b"], id="trailing-backslash"),
+        pytest.param(["3", "pt", r"\begin", "{matrix}"], id="dimension-and-begin"),
+        pytest.param([r"\verb|a", "b|"], id="unterminated-verb"),
+        pytest.param([r"\verb", "x"], id="verb-at-end"),
+        pytest.param(["x\ny", "z"], id="newline"),
+        pytest.param(["x^2", "y", "x^2", "", "x^2", ""], id="repeated"),
+        pytest.param(["a\0b", "c", "a\0b"], id="separator-character"),
+    ],
+)
+@pytest.mark.parametrize("skip_comments", [True, False])
+def test_tokenize_many(latex_strings: list[str], skip_comments: bool) -> None:
+    results = tokenize_many(latex_strings, skip_comments)
+    assert results == [list(tokenize(s, skip_comments)) for s in latex_strings]
+    assert len({id(tokens) for tokens in results}) == len(results)
+
+
+STREAM_LATEX = (
+    r"\begin{bmatrix} 12.5 & -3 pt \\ \frac12 & \frac 1 2 \end{bmatrix} % comment" + "\n"
+    r"\text{a long text} \verb|x y| \operatorname* {sn} \mathbb{R} \kern-1.5pt ∑ é \alpha"
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 1024])
+@pytest.mark.parametrize("skip_comments", [True, False])
+def test_tokenize_stream(chunk_size: int, skip_comments: bool) -> None:
+    expected = list(tokenize(STREAM_LATEX, skip_comments))
+    assert list(tokenize_stream(io.StringIO(STREAM_LATEX), chunk_size, skip_comments)) == expected
+    assert list(tokenize_stream(io.BytesIO(STREAM_LATEX.encode()), chunk_size, skip_comments)) == expected
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        pytest.param(r"\text{unterminated", id="unterminated-text"),
+        pytest.param(r"\verb|unterminated", id="unterminated-verb"),
+        pytest.param("12", id="number"),
+        pytest.param("12 ", id="number-and-space"),
+        pytest.param("\\", id="backslash"),
+        pytest.param("", id="empty"),
+    ],
+)
+def test_tokenize_stream_end(latex: str) -> None:
+    assert list(tokenize_stream(io.StringIO(latex), 1)) == list(tokenize(latex))
+
+
+def test_tokenize_stream_mmap(tmp_path: Path) -> None:
+    path = tmp_path / "matrix.tex"
+    path.write_text(STREAM_LATEX, encoding="utf-8")
+    with path.open("rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert list(tokenize_stream(mapped, 7)) == list(tokenize(STREAM_LATEX))
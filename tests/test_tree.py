@@ -0,0 +1,48 @@
+from xml.etree.ElementTree import tostring
+
+import pytest
+
+from latex2mathml.converter import Converter, convert
+from latex2mathml.tree import Element, SubElement
+
+
+def test_element() -> None:
+    row = Element("mrow", {"class": "a"}, id="b")
+    assert len(row) == 0 and list(row) == [] and row.text is None and row.tail is None
+    x, y, z = SubElement(row, "mi"), SubElement(row, "mo", stretchy="false"), Element("mn")
+    assert len(row) == 2 and row[1] is y and row[:1] == [x]
+    row.append(z)
+    row.remove(x)
+    assert list(row) == [y, z]
+    row[:] = [z]
+    assert list(row) == [z] and row[0] is z
+    row.remove(z)
+    assert len(row) == 0
+    with pytest.raises(ValueError):
+        row.remove(z)
+    assert row.items() == [("class", "a"), ("id", "b")]
+    assert y.get("stretchy") == "false" and x.get("stretchy") is None and x.items() == []
+    x.set("mathvariant", "bold")
+    assert x.attrib == {"mathvariant": "bold"}
+
+
+def test_to_element() -> None:
+    math = Element("math", {"display": "block"})
+    mi = SubElement(SubElement(math, "mrow"), "mi")
+    mi.text = "x"
+    SubElement(math, "mspace", width="1em")
+    assert tostring(math.to_element()) == b'<math display="block"><mrow><mi>x</mi></mrow><mspace width="1em" /></math>'
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        pytest.param(r"\begin{pmatrix} a_{11} & a_{12} \\ a_{21} & a_{22} \end{pmatrix}", id="matrix"),
+        pytest.param(r"\begin{align} a &= 1 \\ b &= \frac{1}{2} \end{align}", id="align"),
+        pytest.param(r"\sum_{i=0}^{n} \color{red}{x_i}", id="attributes"),
+    ],
+)
+def test_convert_matches_element_tree(latex: str) -> None:
+    converter = Converter(display="block")
+    tree = converter.convert_to_tree(latex)
+    assert converter.serialize(tree) == converter.serialize(tree.to_element()) == convert(latex, display="block")
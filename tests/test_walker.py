@@ -1,5 +1,5 @@
 import string
-from typing import Any, Union
+from typing import Any, Iterable, Union
 
 import pytest
 
@@ -1727,6 +1727,54 @@ from latex2mathml.walker import Node, walk
 )
 def test_walk(latex: str, expected: list) -> None:
     assert walk(latex) == expected
+    assert _without_spans(walk(latex, spans=True)) == expected
+
+
+def _without_spans(nodes: Iterable[Node]) -> list[Node]:
+    return [
+        node._replace(span=None, children=None if node.children is None else tuple(_without_spans(node.children)))
+        for node in nodes
+    ]
+
+
+def _spans(latex: str, nodes: Iterable[Node]) -> list:
+    return [
+        (latex[node.span[0] : node.span[1]] if node.span else None, _spans(latex, node.children or ()))
+        for node in nodes
+    ]
+
+
+@pytest.mark.parametrize(
+    "latex, expected",
+    [
+        pytest.param("x^2_3", [("x^2_3", [("x", []), ("3", []), ("2", [])])], id="subsup"),
+        pytest.param(
+            r"\frac{a}{b}",
+            [(r"\frac{a}{b}", [("{a}", [("a", [])]), ("{b}", [("b", [])])])],
+            id="frac",
+        ),
+        pytest.param(
+            r"a \over b",
+            [(r"a \over b", [("a", []), ("b", [])])],
+            id="over",
+        ),
+        pytest.param(
+            r"\sum\limits_i \left(x\right)",
+            [
+                (r"\sum\limits_i", [(r"\sum", []), ("i", [])]),
+                (r"\left(x\right)", [("x", []), (r"\right)", [])]),
+            ],
+            id="limits-and-left",
+        ),
+        pytest.param(
+            r"\newcommand{\f}[1]{#1^2} \f{x} + 1",
+            [(r"\f{x}", [(r"\f{x}", []), (r"\f{x}", [])]), ("+", []), ("1", [])],
+            id="macro",
+        ),
+    ],
+)
+def test_walk_spans(latex: str, expected: list) -> None:
+    assert _spans(latex, walk(latex, spans=True)) == expected
 
 
 @pytest.mark.parametrize(